@@ -1,12 +1,58 @@
 import os
+import argparse
 import logging
+import logging.handlers
 import json
 import hashlib
+import mmap
+import sqlite3
+from stat import S_ISREG
 from datetime import datetime
 from pathlib import Path
 import filecmp
 import difflib
-from typing import Dict, List, Tuple, Any, Set, Optional
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, List, Tuple, Any, Set, Optional, Union
+
+try:
+    # xxHash is much faster than MD5 and content hashes here are only used
+    # for equality checks, so no cryptographic strength is needed
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    # orjson encodes in C even when indenting, where the json module falls
+    # back to its pure-Python encoder
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Name of the content hash in use, stored with cached hashes so a cache written
+# with one algorithm is never compared against hashes from the other
+HASH_ALGORITHM = 'xxh3_128' if xxhash is not None else 'md5'
+
+# Block size used when reading files for hashing
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files larger than this are memory-mapped for hashing instead of read
+MMAP_HASH_THRESHOLD = 64 * 1024
+
+# Files larger than this are only compared byte for byte, not diffed line by line
+MAX_DIFF_BYTES = 2 * 1024 * 1024
+
+# Prefixes of added and removed lines in the .diff files
+DIFF_CHANGE_PREFIXES = ('+ ', '- ')
+
+# Separators used in the detailed differences section of the text report
+DASHES = "-" * 512
+DIFF_ENTRY_SEPARATOR = "\n" + "-" * 80 + "\n\n"
+
+
+def _new_hasher():
+    """Return a new content hasher (XXH3-128 if xxhash is installed, MD5 otherwise)."""
+    return xxhash.xxh3_128() if xxhash is not None else hashlib.md5()
 
 class ProjectComparator:
     """
@@ -37,17 +83,26 @@ class ProjectComparator:
         # Initialize exclusion sets
         self.exclude_dirs = exclude_dirs or set()
         self.exclude_files = exclude_files or set()
-        self.exclude_extensions = exclude_extensions or set()
+        # Extensions are matched case-insensitively, so lowercase them once here
+        self.exclude_extensions = {ext.lower() for ext in (exclude_extensions or set())}
+        
+        self.comparison_report: Dict[str, Any] = {}
         
-        self.comparison_report = {}
+        # Line diffs of changed files are streamed here instead of being kept in the report
+        self.diffs_dir = Path(__file__).parent / "project_comparison_diffs"
+        
+        # Content hashes persisted across runs, keyed by path, size and mtime.
+        # The database is only open while compare_projects runs.
+        self.hash_cache_file = Path(__file__).parent / "project_comparison_hash_cache.sqlite"
+        self.hash_cache: Optional[sqlite3.Connection] = None
         
         # Log initialization details
         self.logger.info("ProjectComparator initialized successfully")
-        self.logger.info(f"Project 1 path: {self.project1_path}")
-        self.logger.info(f"Project 2 path: {self.project2_path}")
-        self.logger.info(f"Excluded directories: {self.exclude_dirs}")
-        self.logger.info(f"Excluded files: {self.exclude_files}")
-        self.logger.info(f"Excluded extensions: {self.exclude_extensions}")
+        self.logger.info("Project 1 path: %s", self.project1_path)
+        self.logger.info("Project 2 path: %s", self.project2_path)
+        self.logger.info("Excluded directories: %s", self.exclude_dirs)
+        self.logger.info("Excluded files: %s", self.exclude_files)
+        self.logger.info("Excluded extensions: %s", self.exclude_extensions)
         
     def _resolve_path(self, path: str) -> Path:
         """
@@ -62,7 +117,7 @@ class ProjectComparator:
         Raises:
             ValueError: If path doesn't exist
         """
-        self.logger.debug(f"Resolving path: {path}")
+        self.logger.debug("Resolving path: %s", path)
         resolved_path = Path(path).resolve()
         
         if not resolved_path.exists():
@@ -70,148 +125,243 @@ class ProjectComparator:
             self.logger.error(error_msg)
             raise ValueError(error_msg)
             
-        self.logger.debug(f"Successfully resolved path to: {resolved_path}")
+        self.logger.debug("Successfully resolved path to: %s", resolved_path)
         return resolved_path
     
     def setup_logging(self):
-        """Setup comprehensive logging configuration."""
+        """
+        Setup comprehensive logging configuration.
+        
+        Records for the log file are buffered and written in batches, when
+        1024 have piled up, on any WARNING or worse, at the end of a
+        comparison and at exit. If the process is killed, the DEBUG/INFO
+        records since the last batch never reach the file.
+        """
         # Get the directory where this script is located
         script_dir = Path(__file__).parent
         log_file = script_dir / "project_comparison_debug.log"
         
-        # Configure logging
-        logging.basicConfig(
-            level=logging.DEBUG,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler()  # Also print to console
-            ]
-        )
         self.logger = logging.getLogger('ProjectComparator')
+        self.logger.setLevel(logging.DEBUG)
+        
+        # Handlers are attached only once, even if several comparators are created
+        if not self.logger.handlers:
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            
+            # Everything goes to the log file; records are buffered in memory
+            # and written in batches rather than one disk write per record.
+            # A warning flushes the batch, so the context leading up to a
+            # problem is on disk even if the process dies afterwards.
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setFormatter(formatter)
+            buffered_handler = logging.handlers.MemoryHandler(
+                capacity=1024, flushLevel=logging.WARNING, target=file_handler
+            )
+            
+            # The console only gets INFO and above; printing every debug line
+            # would make the terminal the bottleneck on large scans
+            console_handler = logging.StreamHandler()
+            console_handler.setLevel(logging.INFO)
+            console_handler.setFormatter(formatter)
+            
+            self.logger.addHandler(buffered_handler)
+            self.logger.addHandler(console_handler)
+            self.logger.propagate = False
         
-        self.logger.info(f"Logging initialized. Log file: {log_file}")
+        self.logger.info("Logging initialized. Log file: %s", log_file)
     
-    def _should_exclude_directory(self, dir_name: str, dir_path: Path) -> bool:
+    def _open_hash_cache(self, cache_file: Path) -> Optional[sqlite3.Connection]:
+        """
+        Open (or create) the sqlite database caching file content hashes.
+        
+        Args:
+            cache_file (Path): Path to the cache database
+            
+        Returns:
+            sqlite3.Connection: Open connection, or None if the cache is unavailable
+        """
+        try:
+            connection = sqlite3.connect(cache_file)
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS file_hashes ("
+                "path TEXT, algorithm TEXT, size INTEGER, mtime_ns INTEGER, hash TEXT, "
+                "PRIMARY KEY (path, algorithm))"
+            )
+            self.logger.debug("Hash cache opened: %s", cache_file)
+            return connection
+        except sqlite3.Error as e:
+            self.logger.warning("Hash cache unavailable, hashing without it: %s", e)
+            return None
+    
+    def _close_hash_cache(self):
+        """Commit the hashes recorded in this run and close the hash cache."""
+        if self.hash_cache is None:
+            return
+        try:
+            self.hash_cache.commit()
+        except sqlite3.Error as e:
+            self.logger.warning("Could not save the hash cache: %s", e)
+        finally:
+            self.hash_cache.close()
+            self.hash_cache = None
+    
+    def _get_cached_hash(self, file_info: Dict[str, Any]) -> Optional[str]:
+        """
+        Look up the hash of a file from an earlier run.
+        
+        Args:
+            file_info (Dict): File info of the file
+            
+        Returns:
+            str: Cached hash, or None if the file is not cached or has changed since
+        """
+        if self.hash_cache is None:
+            return None
+        row = self.hash_cache.execute(
+            "SELECT hash FROM file_hashes WHERE path = ? AND algorithm = ? AND size = ? AND mtime_ns = ?",
+            (file_info['path'], HASH_ALGORITHM, file_info['size'], file_info['mtime_ns'])
+        ).fetchone()
+        return row[0] if row else None
+    
+    def _store_hash(self, file_info: Dict[str, Any]):
+        """
+        Record the hash of a file in the hash cache.
+        
+        Args:
+            file_info (Dict): File info including the computed hash
+        """
+        if self.hash_cache is None or file_info['hash'] in (None, "error"):
+            return
+        self.hash_cache.execute(
+            "INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)",
+            (file_info['path'], HASH_ALGORITHM, file_info['size'], file_info['mtime_ns'], file_info['hash'])
+        )
+    
+    def _clear_diffs_dir(self):
+        """Remove the .diff files an earlier comparison left in the diffs directory."""
+        try:
+            with os.scandir(self.diffs_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.diff') and entry.is_file():
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning("Could not clear old diffs in %s: %s", self.diffs_dir, e)
+    
+    def _flush_log(self):
+        """Write out log records still buffered for the log file."""
+        for handler in self.logger.handlers:
+            handler.flush()
+    
+    def _should_exclude_directory(self, dir_name: str, dir_path: str) -> bool:
         """
         Check if a directory should be excluded from comparison.
         
         Args:
             dir_name (str): Name of the directory
-            dir_path (Path): Full path of the directory
+            dir_path (str): Full path of the directory
             
         Returns:
             bool: True if directory should be excluded
         """
         if dir_name in self.exclude_dirs:
-            self.logger.debug(f"Excluding directory: {dir_path} (name matches exclusion list)")
+            self.logger.debug("Excluding directory: %s (name matches exclusion list)", dir_path)
             return True
         return False
     
-    def _should_exclude_file(self, file_name: str, file_path: Path) -> bool:
+    def _should_exclude_file(self, file_name: str, file_path: str) -> bool:
         """
         Check if a file should be excluded from comparison.
         
         Args:
             file_name (str): Name of the file
-            file_path (Path): Full path of the file
+            file_path (str): Full path of the file
             
         Returns:
             bool: True if file should be excluded
         """
         # Check file name exclusion
         if file_name in self.exclude_files:
-            self.logger.debug(f"Excluding file: {file_path} (name matches exclusion list)")
+            self.logger.debug("Excluding file: %s (name matches exclusion list)", file_path)
             return True
         
-        # Check file extension exclusion
-        file_extension = file_path.suffix.lower()
+        # Check file extension exclusion (a leading dot does not start an extension)
+        dot = file_name.rfind('.')
+        file_extension = file_name[dot:].lower() if dot > 0 else ''
         if file_extension in self.exclude_extensions:
-            self.logger.debug(f"Excluding file: {file_path} (extension {file_extension} matches exclusion list)")
+            self.logger.debug("Excluding file: %s (extension %s matches exclusion list)", file_path, file_extension)
             return True
         
         return False
     
-    def _is_directory_empty(self, dir_path: Path) -> bool:
+    def _is_directory_empty(self, dir_path: Union[str, Path]) -> bool:
         """
         Check if a directory is empty.
         
         Args:
-            dir_path (Path): Path to the directory
+            dir_path (str or Path): Path to the directory
             
         Returns:
             bool: True if directory is empty
         """
         try:
-            # Check if directory exists and has no items (excluding . and ..)
-            return not any(item for item in dir_path.iterdir() if item.name not in ['.', '..'])
-        except Exception as e:
-            self.logger.debug(f"Error checking if directory is empty {dir_path}: {str(e)}")
-            return False
-    
-    def _is_file_empty(self, file_path: Path) -> bool:
-        """
-        Check if a file is empty.
-        
-        Args:
-            file_path (Path): Path to the file
-            
-        Returns:
-            bool: True if file is empty
-        """
-        try:
-            return file_path.stat().st_size == 0
+            # Only the first entry is needed, so stop listing as soon as one is found
+            with os.scandir(dir_path) as entries:
+                return next(entries, None) is None
         except Exception as e:
-            self.logger.debug(f"Error checking if file is empty {file_path}: {str(e)}")
+            self.logger.debug("Error checking if directory is empty %s: %s", dir_path, e)
             return False
     
-    def get_file_info(self, file_path: Path) -> Dict[str, Any]:
+    def get_file_info(self, file_path: Union[str, Path]) -> Dict[str, Any]:
         """
         Get detailed information about a file.
         
         Args:
-            file_path (Path): Path to the file
+            file_path (str or Path): Path to the file
             
         Returns:
-            Dict: File information including stats and hash
+            Dict: File information including stats
         """
         try:
-            stat = file_path.stat()
+            stat = os.stat(file_path)
             file_info = {
-                'name': file_path.name,
+                'name': os.path.basename(file_path),
                 'path': str(file_path),
                 'size': stat.st_size,
                 'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                'mtime_ns': stat.st_mtime_ns,
                 'is_file': True,
                 'is_dir': False,
-                'is_empty': self._is_file_empty(file_path)
+                'is_empty': stat.st_size == 0
             }
             
-            # Calculate file hash for content comparison
-            if file_path.is_file():
-                file_info['hash'] = self._calculate_file_hash(file_path)
+            # The content hash is only computed when needed, see _files_match.
+            # Anything other than a regular file is never hashed.
+            if not S_ISREG(stat.st_mode):
+                file_info['hash'] = None
                 
             return file_info
             
         except Exception as e:
-            self.logger.error(f"Error getting file info for {file_path}: {str(e)}")
+            self.logger.error("Error getting file info for %s: %s", file_path, e)
             return {}
     
-    def get_directory_info(self, dir_path: Path) -> Dict[str, Any]:
+    def get_directory_info(self, dir_path: Union[str, Path]) -> Dict[str, Any]:
         """
         Get detailed information about a directory.
         
         Args:
-            dir_path (Path): Path to the directory
+            dir_path (str or Path): Path to the directory
             
         Returns:
             Dict: Directory information
         """
         try:
-            stat = dir_path.stat()
+            stat = os.stat(dir_path)
             return {
-                'name': dir_path.name,
+                'name': os.path.basename(dir_path),
                 'path': str(dir_path),
                 'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 'modified': datetime.fromtimestamp(stat.st_mtime).isoformat(),
@@ -220,32 +370,134 @@ class ProjectComparator:
                 'is_empty': self._is_directory_empty(dir_path)
             }
         except Exception as e:
-            self.logger.error(f"Error getting directory info for {dir_path}: {str(e)}")
+            self.logger.error("Error getting directory info for %s: %s", dir_path, e)
             return {}
     
-    def _calculate_file_hash(self, file_path: Path) -> str:
+    def _calculate_file_hash(self, file_path: str) -> str:
         """
-        Calculate MD5 hash of file content.
+        Calculate a hash of file content (XXH3-128 if xxhash is installed, MD5 otherwise).
         
         Args:
-            file_path (Path): Path to the file
+            file_path (str): Path to the file
             
         Returns:
-            str: MD5 hash of file content
+            str: Hex digest of file content
         """
         try:
-            hasher = hashlib.md5()
-            with open(file_path, 'rb') as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    hasher.update(chunk)
+            hasher = _new_hasher()
+            with open(file_path, 'rb', buffering=0) as f:
+                size = os.fstat(f.fileno()).st_size
+                if size > MMAP_HASH_THRESHOLD:
+                    # Large files are hashed in a single call straight from
+                    # the page cache, without copying them into user space
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mmap, 'MADV_SEQUENTIAL'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        hasher.update(mm)
+                    return hasher.hexdigest()
+                
+                # Small files are read unbuffered into one buffer sized to
+                # the file, so no intermediate copy is made by BufferedReader
+                view = memoryview(bytearray(min(size, HASH_CHUNK_SIZE) or 4096))
+                while True:
+                    n = f.readinto(view)
+                    if not n:
+                        break
+                    hasher.update(view[:n])
             return hasher.hexdigest()
         except Exception as e:
-            self.logger.error(f"Error calculating hash for {file_path}: {str(e)}")
+            self.logger.error("Error calculating hash for %s: %s", file_path, e)
             return "error"
     
+    def _files_match(self, file1_info: Dict[str, Any], file2_info: Dict[str, Any]) -> Optional[bool]:
+        """
+        Check whether two files have the same content, comparing sizes first
+        and reading the files only when the sizes are equal. Hashes are cached
+        in the file info dicts.
+        
+        Args:
+            file1_info (Dict): File info from project 1
+            file2_info (Dict): File info from project 2
+            
+        Returns:
+            bool: True if the files have the same content, None if they could
+                not be read to compare them
+        """
+        if file1_info.get('size') != file2_info.get('size'):
+            return False
+        
+        # Both infos are empty if neither file could be stat-ed
+        if not file1_info:
+            return True
+        
+        # Reuse hashes from an earlier run for files unchanged since then
+        for file_info in (file1_info, file2_info):
+            if 'hash' not in file_info:
+                cached_hash = self._get_cached_hash(file_info)
+                if cached_hash is not None:
+                    file_info['hash'] = cached_hash
+        
+        # Compare hashes if one is already known (None for non-regular files)
+        if 'hash' in file1_info or 'hash' in file2_info:
+            for file_info in (file1_info, file2_info):
+                if 'hash' not in file_info:
+                    file_info['hash'] = self._calculate_file_hash(file_info['path'])
+                    self._store_hash(file_info)
+            return file1_info['hash'] == file2_info['hash']
+        
+        return self._compare_file_bytes(file1_info, file2_info)
+    
+    def _compare_file_bytes(self, file1_info: Dict[str, Any], file2_info: Dict[str, Any]) -> Optional[bool]:
+        """
+        Compare two files of equal size block by block in a single pass over
+        each, stopping at the first difference. When the files are equal, the
+        hash of their common content is recorded in both file info dicts.
+        
+        Args:
+            file1_info (Dict): File info from project 1
+            file2_info (Dict): File info from project 2
+            
+        Returns:
+            bool: True if the files have the same content, None if they could
+                not be read
+        """
+        try:
+            hasher = _new_hasher()
+            block_size = min(file1_info['size'], HASH_CHUNK_SIZE) or 4096
+            buffer1 = bytearray(block_size)
+            buffer2 = bytearray(block_size)
+            # BufferedReader.readinto fills the whole buffer unless at EOF, so
+            # blocks of equal files line up. Full blocks are compared as whole
+            # bytearrays, which is a single memcmp (vectorised by the C library)
+            # and avoids comparing memoryviews, which goes element by element.
+            # Only the content of one side is hashed.
+            with open(file1_info['path'], 'rb') as f1, open(file2_info['path'], 'rb') as f2:
+                while True:
+                    n1 = f1.readinto(buffer1)
+                    n2 = f2.readinto(buffer2)
+                    if n1 != n2:
+                        return False
+                    if n1 == block_size:
+                        if buffer1 != buffer2:
+                            return False
+                        hasher.update(buffer1)
+                        continue
+                    if buffer1[:n1] != buffer2[:n2]:
+                        return False
+                    hasher.update(buffer1[:n1])
+                    break
+            
+            file1_info['hash'] = file2_info['hash'] = hasher.hexdigest()
+            self._store_hash(file1_info)
+            self._store_hash(file2_info)
+            return True
+        except Exception as e:
+            self.logger.error("Error comparing %s and %s: %s", file1_info['path'], file2_info['path'], e)
+            return None
+    
     def scan_project_structure(self, project_path: Path) -> Dict[str, Any]:
         """
-        Recursively scan and collect information about project structure with exclusions.
+        Scan and collect information about project structure with exclusions.
         
         Args:
             project_path (Path): Root path of the project
@@ -253,74 +505,158 @@ class ProjectComparator:
         Returns:
             Dict: Complete project structure with files and directories
         """
-        self.logger.info(f"Scanning project structure: {project_path}")
+        self.logger.info("Scanning project structure: %s", project_path)
         
-        def _scan_directory(current_path: Path) -> Dict[str, Any]:
-            structure = {
-                'directories': {},
-                'files': {}
-            }
+        # Files are only recorded during the walk; their info is gathered
+        # afterwards on a thread pool
+        pending_files: List[Tuple[Dict[str, Any], str, str]] = []
+        
+        def _on_walk_error(error: OSError):
+            if isinstance(error, PermissionError):
+                self.logger.warning("Permission denied accessing %s: %s", error.filename, error)
+            else:
+                self.logger.error("Error scanning %s: %s", error.filename, error)
+        
+        root_info = self.get_directory_info(project_path)
+        structure: Dict[str, Dict[str, Any]] = {
+            'directories': {},
+            'files': {}
+        }
+        
+        # os.walk does the traversal without Python-level recursion. Each
+        # directory about to be walked maps to the node of the nested
+        # structure its contents go into; excluded directories are pruned
+        # from dirs in place so they are never entered. Symlinked
+        # directories are listed but not followed.
+        # Paths are handled as plain strings; relative paths are sliced off
+        # the joined path instead of building Path objects for every entry
+        root_str = str(project_path)
+        prefix_len = len(os.path.join(root_str, ''))
+        nodes = {root_str: structure}
+        for root, dirs, files in os.walk(root_str, onerror=_on_walk_error):
+            node = nodes.pop(root)
             
-            try:
-                for item in current_path.iterdir():
-                    relative_path = item.relative_to(project_path)
+            kept_dirs = []
+            for name in dirs:
+                item = os.path.join(root, name)
+                if self._should_exclude_directory(name, item):
+                    self.logger.debug("Skipping excluded directory: %s", item)
+                    continue
                     
-                    # Check if directory should be excluded
-                    if item.is_dir():
-                        if self._should_exclude_directory(item.name, item):
-                            self.logger.debug(f"Skipping excluded directory: {item}")
-                            continue
-                            
-                        structure['directories'][str(relative_path)] = {
-                            'info': self.get_directory_info(item),
-                            'contents': _scan_directory(item)
-                        }
-                    else:
-                        # Check if file should be excluded
-                        if self._should_exclude_file(item.name, item):
-                            self.logger.debug(f"Skipping excluded file: {item}")
-                            continue
-                            
-                        structure['files'][str(relative_path)] = self.get_file_info(item)
-                        
-            except PermissionError as e:
-                self.logger.warning(f"Permission denied accessing {current_path}: {str(e)}")
-            except Exception as e:
-                self.logger.error(f"Error scanning {current_path}: {str(e)}")
-                
-            return structure
+                kept_dirs.append(name)
+                contents: Dict[str, Dict[str, Any]] = {
+                    'directories': {},
+                    'files': {}
+                }
+                node['directories'][item[prefix_len:]] = {
+                    'info': self.get_directory_info(item),
+                    'contents': contents
+                }
+                nodes[item] = contents
+            dirs[:] = kept_dirs
+            
+            for name in files:
+                item = os.path.join(root, name)
+                if self._should_exclude_file(name, item):
+                    self.logger.debug("Skipping excluded file: %s", item)
+                    continue
+                    
+                relative_path = item[prefix_len:]
+                node['files'][relative_path] = None
+                pending_files.append((node['files'], relative_path, item))
+        
+        # Collecting file info is I/O bound, so the files are processed concurrently
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_infos = executor.map(self.get_file_info, [item for _, _, item in pending_files])
+            for (file_node, key, _), file_info in zip(pending_files, file_infos):
+                file_node[key] = file_info
         
         return {
-            'root_info': self.get_directory_info(project_path),
-            'structure': _scan_directory(project_path)
+            'root_info': root_info,
+            'structure': structure
         }
     
-    def compare_files_content(self, file1_path: Path, file2_path: Path) -> Dict[str, Any]:
+    def compare_files_content(self, file1_path: Path, file2_path: Path,
+                              file1_info: Optional[Dict[str, Any]] = None,
+                              file2_info: Optional[Dict[str, Any]] = None,
+                              max_diff_bytes: int = MAX_DIFF_BYTES,
+                              known_identical: Optional[bool] = None) -> Dict[str, Any]:
         """
         Compare content of two files and generate detailed differences.
         
         Args:
             file1_path (Path): Path to first file
             file2_path (Path): Path to second file
+            file1_info (Dict): Optional file info for the first file, used for
+                its size and (cached) hash
+            file2_info (Dict): Optional file info for the second file
+            max_diff_bytes (int): Files larger than this are compared byte for
+                byte without producing a line diff
+            known_identical (bool): Result of an earlier content comparison of
+                the two files, so they are not read again to establish it
             
         Returns:
             Dict: Comparison results
         """
-        self.logger.debug(f"Comparing file content: {file1_path} vs {file2_path}")
+        self.logger.debug("Comparing file content: %s vs %s", file1_path, file2_path)
         
         try:
+            # A known result, different sizes or known hashes settle equality
+            # without reading
+            identical = known_identical
+            if identical is None and file1_info and file2_info:
+                if file1_info['size'] != file2_info['size']:
+                    identical = False
+                elif 'hash' in file1_info and 'hash' in file2_info:
+                    identical = file1_info['hash'] == file2_info['hash']
+            if identical:
+                return {'identical': True}
+            
+            size1 = file1_info['size'] if file1_info else os.stat(file1_path).st_size
+            size2 = file2_info['size'] if file2_info else os.stat(file2_path).st_size
+            if max(size1, size2) > max_diff_bytes:
+                # Reading huge files into lists of lines for a diff is too
+                # costly; only report whether their bytes are equal
+                if identical is None:
+                    identical = filecmp.cmp(file1_path, file2_path, shallow=False)
+                return {
+                    'identical': identical,
+                    'diff_skipped': True
+                }
+            
             with open(file1_path, 'r', encoding='utf-8', errors='ignore') as f1:
                 content1 = f1.readlines()
             with open(file2_path, 'r', encoding='utf-8', errors='ignore') as f2:
                 content2 = f2.readlines()
                 
-            differ = difflib.Differ()
-            diff = list(differ.compare(content1, content2))
-            
-            # Count differences
-            added = sum(1 for line in diff if line.startswith('+ '))
-            removed = sum(1 for line in diff if line.startswith('- '))
-            changed = sum(1 for line in diff if line.startswith('? '))
+            # Build the diff from SequenceMatcher's line opcodes rather than
+            # difflib.Differ, which additionally runs a character-level match
+            # on every replaced line pair just to produce '? ' hint lines.
+            # Lines use the same '  ', '- ' and '+ ' prefixes as Differ and are
+            # written straight to a .diff file, so the report only holds counts.
+            # diff_lines counts only the '- ' and '+ ' lines the report shows.
+            matcher = difflib.SequenceMatcher(None, content1, content2)
+            os.makedirs(self.diffs_dir, exist_ok=True)
+            diff_file = self.diffs_dir / (hashlib.md5(str(file1_path).encode('utf-8')).hexdigest() + '.diff')
+            added = removed = changed = 0
+            with open(diff_file, 'w', encoding='utf-8') as out:
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                    if tag == 'equal':
+                        blocks: Tuple[Tuple[str, List[str]], ...] = (('  ', content1[i1:i2]),)
+                    else:
+                        blocks = (('- ', content1[i1:i2]), ('+ ', content2[j1:j2]))
+                        removed += i2 - i1
+                        added += j2 - j1
+                        if tag == 'replace':
+                            changed += min(i2 - i1, j2 - j1)
+                    for prefix, lines in blocks:
+                        for line in lines:
+                            out.write(prefix + line)
+                            # Keep one diff line per file line, even for a final
+                            # line without a newline
+                            if not line.endswith('\n'):
+                                out.write('\n')
             
             return {
                 'identical': content1 == content2,
@@ -332,14 +668,15 @@ class ProjectComparator:
                     'changed_lines': changed,
                     'total_changes': added + removed + changed
                 },
-                'diff_output': diff
+                'diff_file': str(diff_file),
+                'diff_lines': added + removed
             }
             
         except UnicodeDecodeError:
-            self.logger.warning(f"Binary file detected, skipping content comparison: {file1_path}")
+            self.logger.warning("Binary file detected, skipping content comparison: %s", file1_path)
             return {'identical': None, 'binary_file': True}
         except Exception as e:
-            self.logger.error(f"Error comparing file content {file1_path} vs {file2_path}: {str(e)}")
+            self.logger.error("Error comparing file content %s vs %s: %s", file1_path, file2_path, e)
             return {'identical': None, 'error': str(e)}
     
     def compare_projects(self) -> Dict[str, Any]:
@@ -351,6 +688,10 @@ class ProjectComparator:
         """
         self.logger.info("Starting project comparison...")
         
+        # The diffs directory is shared between runs, so the previous run's
+        # diffs are removed before this run writes its own
+        self._clear_diffs_dir()
+        
         # Scan both projects
         project1_structure = self.scan_project_structure(self.project1_path)
         project2_structure = self.scan_project_structure(self.project2_path)
@@ -385,111 +726,78 @@ class ProjectComparator:
             }
         }
         
-        # Compare directories
-        self._compare_directories(
-            project1_structure['structure'], 
-            project2_structure['structure'], 
-            comparison_report
-        )
-        
-        # Compare files
-        self._compare_files(
-            project1_structure['structure'], 
-            project2_structure['structure'], 
-            comparison_report
-        )
+        # Compare directories and files in a single pass over both trees. The
+        # hash cache is closed afterwards even if the comparison fails.
+        self.hash_cache = self._open_hash_cache(self.hash_cache_file)
+        try:
+            self._compare_tree(
+                project1_structure['structure'], 
+                project2_structure['structure'], 
+                comparison_report
+            )
+        finally:
+            self._close_hash_cache()
         
         self.comparison_report = comparison_report
         self.logger.info("Project comparison completed successfully")
+        self._flush_log()
         
         return comparison_report
     
-    def _compare_directories(self, struct1: Dict, struct2: Dict, report: Dict):
-        """Compare directory structures recursively."""
-        dirs1 = set(struct1['directories'].keys())
-        dirs2 = set(struct2['directories'].keys())
-        
-        common_dirs = dirs1.intersection(dirs2)
-        unique_dirs1 = dirs1 - dirs2
-        unique_dirs2 = dirs2 - dirs1
-        
-        # Update summary
-        report['summary']['unique_directories_project1'] += len(unique_dirs1)
-        report['summary']['unique_directories_project2'] += len(unique_dirs2)
-        
-        # Record directory differences
-        for dir_path in common_dirs:
-            dir1_info = struct1['directories'][dir_path]['info']
-            dir2_info = struct2['directories'][dir_path]['info']
-            
-            report['directory_comparison'][dir_path] = {
-                'status': 'common',
-                'project1_info': dir1_info,
-                'project2_info': dir2_info,
-                'latest_version': self._get_latest_info(dir1_info, dir2_info),
-                'is_empty_project1': dir1_info.get('is_empty', False),
-                'is_empty_project2': dir2_info.get('is_empty', False)
-            }
-            
-            # Recursively compare subdirectories
-            self._compare_directories(
-                struct1['directories'][dir_path]['contents'],
-                struct2['directories'][dir_path]['contents'],
-                report
-            )
-        
-        for dir_path in unique_dirs1:
-            dir_info = struct1['directories'][dir_path]['info']
-            report['directory_comparison'][dir_path] = {
-                'status': 'only_in_project1',
-                'project1_info': dir_info,
-                'latest_version': 'Project 1',
-                'is_empty_project1': dir_info.get('is_empty', False),
-                'is_empty_project2': None
-            }
-        
-        for dir_path in unique_dirs2:
-            dir_info = struct2['directories'][dir_path]['info']
-            report['directory_comparison'][dir_path] = {
-                'status': 'only_in_project2',
-                'project2_info': dir_info,
-                'latest_version': 'Project 2',
-                'is_empty_project1': None,
-                'is_empty_project2': dir_info.get('is_empty', False)
-            }
-    
-    def _compare_files(self, struct1: Dict, struct2: Dict, report: Dict):
-        """Compare files recursively."""
-        files1 = set(struct1['files'].keys())
-        files2 = set(struct2['files'].keys())
-        
-        common_files = files1.intersection(files2)
+    def _compare_tree(self, struct1: Dict, struct2: Dict, report: Dict):
+        """Compare the files and directories of one level, then recurse into common directories."""
+        # Dict key views support set operations directly, so the names are
+        # never copied into intermediate sets first
+        # The per-file loops below run once per file in the tree, so the
+        # nested dicts they use are looked up once here
+        file_infos1 = struct1['files']
+        file_infos2 = struct2['files']
+        summary = report['summary']
+        file_comparison = report['file_comparison']
+        
+        files1 = file_infos1.keys()
+        files2 = file_infos2.keys()
+        dirs1 = struct1['directories'].keys()
+        dirs2 = struct2['directories'].keys()
+        
+        common_files = files1 & files2
         unique_files1 = files1 - files2
         unique_files2 = files2 - files1
+        common_dirs = dirs1 & dirs2
+        unique_dirs1 = dirs1 - dirs2
+        unique_dirs2 = dirs2 - dirs1
         
         # Update summary
-        report['summary']['unique_files_project1'] += len(unique_files1)
-        report['summary']['unique_files_project2'] += len(unique_files2)
+        summary['unique_files_project1'] += len(unique_files1)
+        summary['unique_files_project2'] += len(unique_files2)
+        summary['unique_directories_project1'] += len(unique_dirs1)
+        summary['unique_directories_project2'] += len(unique_dirs2)
         
         # Compare common files
         for file_path in common_files:
-            file1_info = struct1['files'][file_path]
-            file2_info = struct2['files'][file_path]
+            file1_info = file_infos1[file_path]
+            file2_info = file_infos2[file_path]
             
-            # Compare content if hashes are different
+            # Compare content if sizes or hashes are different
             content_comparison = None
-            if file1_info.get('hash') != file2_info.get('hash'):
+            files_match = self._files_match(file1_info, file2_info)
+            if not files_match:
+                # A mismatch already found is passed on, so large files are
+                # not compared a second time
                 content_comparison = self.compare_files_content(
                     Path(file1_info['path']), 
-                    Path(file2_info['path'])
+                    Path(file2_info['path']),
+                    file1_info,
+                    file2_info,
+                    known_identical=files_match
                 )
                 
                 if content_comparison and content_comparison.get('identical') is False:
-                    report['summary']['common_files_different_content'] += 1
+                    summary['common_files_different_content'] += 1
                 elif content_comparison and content_comparison.get('identical'):
-                    report['summary']['common_files_identical_content'] += 1
+                    summary['common_files_identical_content'] += 1
             
-            report['file_comparison'][file_path] = {
+            file_comparison[file_path] = {
                 'status': 'common',
                 'project1_info': file1_info,
                 'project2_info': file2_info,
@@ -501,8 +809,8 @@ class ProjectComparator:
         
         # Record unique files
         for file_path in unique_files1:
-            file_info = struct1['files'][file_path]
-            report['file_comparison'][file_path] = {
+            file_info = file_infos1[file_path]
+            file_comparison[file_path] = {
                 'status': 'only_in_project1',
                 'project1_info': file_info,
                 'latest_version': 'Project 1',
@@ -511,8 +819,8 @@ class ProjectComparator:
             }
         
         for file_path in unique_files2:
-            file_info = struct2['files'][file_path]
-            report['file_comparison'][file_path] = {
+            file_info = file_infos2[file_path]
+            file_comparison[file_path] = {
                 'status': 'only_in_project2',
                 'project2_info': file_info,
                 'latest_version': 'Project 2',
@@ -520,29 +828,63 @@ class ProjectComparator:
                 'is_empty_project2': file_info.get('is_empty', False)
             }
         
-        # Recursively compare files in subdirectories
-        common_dirs = set(struct1['directories'].keys()).intersection(set(struct2['directories'].keys()))
+        # Record common directories
         for dir_path in common_dirs:
-            self._compare_files(
+            dir1_info = struct1['directories'][dir_path]['info']
+            dir2_info = struct2['directories'][dir_path]['info']
+            
+            report['directory_comparison'][dir_path] = {
+                'status': 'common',
+                'project1_info': dir1_info,
+                'project2_info': dir2_info,
+                'latest_version': self._get_latest_info(dir1_info, dir2_info),
+                'is_empty_project1': dir1_info.get('is_empty', False),
+                'is_empty_project2': dir2_info.get('is_empty', False)
+            }
+            
+            # Recursively compare subdirectories and their files
+            self._compare_tree(
                 struct1['directories'][dir_path]['contents'],
                 struct2['directories'][dir_path]['contents'],
                 report
             )
+        
+        for dir_path in unique_dirs1:
+            dir_info = struct1['directories'][dir_path]['info']
+            report['directory_comparison'][dir_path] = {
+                'status': 'only_in_project1',
+                'project1_info': dir_info,
+                'latest_version': 'Project 1',
+                'is_empty_project1': dir_info.get('is_empty', False),
+                'is_empty_project2': None
+            }
+        
+        for dir_path in unique_dirs2:
+            dir_info = struct2['directories'][dir_path]['info']
+            report['directory_comparison'][dir_path] = {
+                'status': 'only_in_project2',
+                'project2_info': dir_info,
+                'latest_version': 'Project 2',
+                'is_empty_project1': None,
+                'is_empty_project2': dir_info.get('is_empty', False)
+            }
     
-    def _format_table(self, headers: List[str], rows: List[List[str]], col_widths: List[int] = None) -> str:
+    def _iter_table_lines(self, headers: List[str], rows: List[List[str]], col_widths: Optional[List[int]] = None):
         """
-        Format data as a table.
+        Yield the lines of a table one at a time, so a large table can be
+        written out without first building it as a single string.
         
         Args:
             headers: List of header strings
             rows: List of rows (each row is a list of strings)
             col_widths: Optional list of column widths
             
-        Returns:
-            Formatted table as string
+        Yields:
+            Formatted table lines, each ending in a newline
         """
         if not rows:
-            return "No data available\n"
+            yield "No data available\n"
+            return
             
         # Calculate column widths if not provided
         if not col_widths:
@@ -555,19 +897,30 @@ class ProjectComparator:
         # Add padding
         col_widths = [w + 2 for w in col_widths]
         
-        # Create separator line
+        # Create separator line and a format string shared by all rows
         separator = "+" + "+".join("-" * w for w in col_widths) + "+\n"
+        row_format = "|" + "|".join(f" {{:<{w-2}}} " for w in col_widths) + "|\n"
         
-        # Build table
-        table = separator
-        table += "|" + "|".join(f" {h:<{col_widths[i]-2}} " for i, h in enumerate(headers)) + "|\n"
-        table += separator
-        
+        yield separator
+        yield row_format.format(*headers)
+        yield separator
         for row in rows:
-            table += "|" + "|".join(f" {str(cell):<{col_widths[i]-2}} " for i, cell in enumerate(row)) + "|\n"
+            yield row_format.format(*map(str, row))
+        yield separator
+    
+    def _format_table(self, headers: List[str], rows: List[List[str]], col_widths: Optional[List[int]] = None) -> str:
+        """
+        Format data as a table.
         
-        table += separator
-        return table
+        Args:
+            headers: List of header strings
+            rows: List of rows (each row is a list of strings)
+            col_widths: Optional list of column widths
+            
+        Returns:
+            Formatted table as string
+        """
+        return "".join(self._iter_table_lines(headers, rows, col_widths))
     
     def _get_latest_info(self, info1: Dict, info2: Dict) -> str:
         """
@@ -596,13 +949,13 @@ class ProjectComparator:
         except:
             return "N/A"
     
-    def _get_empty_status(self, is_empty1: bool, is_empty2: bool, status: str) -> str:
+    def _get_empty_status(self, is_empty1: Optional[bool], is_empty2: Optional[bool], status: str) -> str:
         """
         Get formatted empty status for display.
         
         Args:
-            is_empty1: Empty status for project 1
-            is_empty2: Empty status for project 2
+            is_empty1: Empty status for project 1 (None if it has no such item)
+            is_empty2: Empty status for project 2 (None if it has no such item)
             status: Comparison status
             
         Returns:
@@ -635,28 +988,60 @@ class ProjectComparator:
         
         script_dir = Path(__file__).parent
         report_file = script_dir / "project_comparison_report.txt"
+        report = self.comparison_report
+        
+        # The empty status of every row comes from this table rather than a
+        # _get_empty_status call. The empty flags are True, False or None
+        # (side missing), so every combination is precomputed.
+        empty_statuses = {
+            (is_empty1, is_empty2, status): self._get_empty_status(is_empty1, is_empty2, status)
+            for is_empty1 in (True, False, None)
+            for is_empty2 in (True, False, None)
+            for status in ('common', 'only_in_project1', 'only_in_project2')
+        }
         
         try:
-            with open(report_file, 'w', encoding='utf-8') as f:
-                f.write("PROJECT COMPARISON REPORT\n")
-                f.write("=" * 50 + "\n\n")
+            # Each section is collected as a list of fragments (tables line by
+            # line) and written with a single write of the joined text, rather
+            # than one write call per line. Flushing per section keeps memory
+            # bounded by the largest section, not the whole report.
+            # Sections are already batched, so the file is opened unbuffered
+            # in binary mode and each one is encoded once and handed straight
+            # to the OS, skipping the text and buffered layers.
+            with open(report_file, 'wb', buffering=0) as f:
+                buf: List[str] = []
+                write = buf.append
+                
+                def flush_section():
+                    text = "".join(buf)
+                    if os.linesep != "\n":
+                        # Same newline translation as a text mode file
+                        text = text.replace("\n", os.linesep)
+                    data = memoryview(text.encode('utf-8'))
+                    # A raw write may write only part of the data
+                    while data:
+                        data = data[f.write(data):]
+                    buf.clear()
+                
+                write("PROJECT COMPARISON REPORT\n")
+                write("=" * 50 + "\n\n")
                 
-                f.write(f"Comparison Date: {self.comparison_report['comparison_timestamp']}\n")
-                f.write(f"Project 1: {self.comparison_report['project1']['path']}\n")
-                f.write(f"Project 2: {self.comparison_report['project2']['path']}\n\n")
+                write(f"Comparison Date: {report['comparison_timestamp']}\n")
+                write(f"Project 1: {report['project1']['path']}\n")
+                write(f"Project 2: {report['project2']['path']}\n\n")
                 
                 # Exclusion Settings Section
-                f.write("EXCLUSION SETTINGS\n")
-                f.write("-" * 20 + "\n")
-                excl_settings = self.comparison_report['exclusion_settings']
-                f.write(f"Excluded directories: {', '.join(excl_settings['excluded_directories']) or 'None'}\n")
-                f.write(f"Excluded files: {', '.join(excl_settings['excluded_files']) or 'None'}\n")
-                f.write(f"Excluded extensions: {', '.join(excl_settings['excluded_extensions']) or 'None'}\n\n")
+                write("EXCLUSION SETTINGS\n")
+                write("-" * 20 + "\n")
+                excl_settings = report['exclusion_settings']
+                write(f"Excluded directories: {', '.join(excl_settings['excluded_directories']) or 'None'}\n")
+                write(f"Excluded files: {', '.join(excl_settings['excluded_files']) or 'None'}\n")
+                write(f"Excluded extensions: {', '.join(excl_settings['excluded_extensions']) or 'None'}\n\n")
                 
                 # Summary Section
-                f.write("SUMMARY\n")
-                f.write("-" * 20 + "\n")
-                summary = self.comparison_report['summary']
+                write("SUMMARY\n")
+                write("-" * 20 + "\n")
+                summary = report['summary']
                 summary_rows = [
                     ["Unique directories in Project 1", str(summary['unique_directories_project1'])],
                     ["Unique directories in Project 2", str(summary['unique_directories_project2'])],
@@ -665,26 +1050,28 @@ class ProjectComparator:
                     ["Common files with identical content", str(summary['common_files_identical_content'])],
                     ["Common files with different content", str(summary['common_files_different_content'])]
                 ]
-                f.write(self._format_table(["Metric", "Count"], summary_rows))
-                f.write("\n")
+                buf.extend(self._iter_table_lines(["Metric", "Count"], summary_rows))
+                write("\n")
+                
+                flush_section()
                 
                 # Directory Comparison Section
-                f.write("DIRECTORY COMPARISON\n")
-                f.write("-" * 25 + "\n")
+                write("DIRECTORY COMPARISON\n")
+                write("-" * 25 + "\n")
                 
                 # Group directories by status
                 common_dirs = []
                 only_in_project1_dirs = []
                 only_in_project2_dirs = []
                 
-                for dir_path, comparison in self.comparison_report['directory_comparison'].items():
+                for dir_path, comparison in report['directory_comparison'].items():
                     status = comparison['status']
                     latest = comparison.get('latest_version', 'N/A')
-                    empty_status = self._get_empty_status(
+                    empty_status = empty_statuses.get((
                         comparison.get('is_empty_project1', False),
                         comparison.get('is_empty_project2', False),
                         status
-                    )
+                    ), "N/A")
                     
                     if status == 'common':
                         common_dirs.append([dir_path, "EXISTS IN BOTH", latest, empty_status])
@@ -695,159 +1082,192 @@ class ProjectComparator:
                 
                 # Write common directories
                 if common_dirs:
-                    f.write("\nCOMMON DIRECTORIES (Exist in both projects):\n")
-                    f.write(self._format_table(
+                    write("\nCOMMON DIRECTORIES (Exist in both projects):\n")
+                    buf.extend(self._iter_table_lines(
                         ["Directory Path", "Status", "Latest Version", "Empty Status"], 
                         common_dirs
                     ))
                 
                 # Write unique directories
                 if only_in_project1_dirs:
-                    f.write("\nUNIQUE DIRECTORIES (Only in Project 1):\n")
-                    f.write(self._format_table(
+                    write("\nUNIQUE DIRECTORIES (Only in Project 1):\n")
+                    buf.extend(self._iter_table_lines(
                         ["Directory Path", "Status", "Latest Version", "Empty Status"], 
                         only_in_project1_dirs
                     ))
                 
                 if only_in_project2_dirs:
-                    f.write("\nUNIQUE DIRECTORIES (Only in Project 2):\n")
-                    f.write(self._format_table(
+                    write("\nUNIQUE DIRECTORIES (Only in Project 2):\n")
+                    buf.extend(self._iter_table_lines(
                         ["Directory Path", "Status", "Latest Version", "Empty Status"], 
                         only_in_project2_dirs
                     ))
                 
                 if not common_dirs and not only_in_project1_dirs and not only_in_project2_dirs:
-                    f.write("No directories found for comparison.\n")
+                    write("No directories found for comparison.\n")
+                
+                flush_section()
                 
                 # File Comparison Section
-                f.write("\n" + "="*80 + "\n")
-                f.write("FILE COMPARISON\n")
-                f.write("="*80 + "\n\n")
+                write("\n" + "="*80 + "\n")
+                write("FILE COMPARISON\n")
+                write("="*80 + "\n\n")
                 
                 # Group files by status
-                identical_files = []
-                different_content_files = []
-                not_compared_files = []
-                only_in_project1_files = []
-                only_in_project2_files = []
+                identical_files: List[List[str]] = []
+                different_content_files: List[List[str]] = []
+                not_compared_files: List[List[str]] = []
+                only_in_project1_files: List[List[str]] = []
+                only_in_project2_files: List[List[str]] = []
+                # Files with different content, kept for the detailed differences
+                # section so the comparison dict is only walked once
+                diff_entries = []
+                
+                # Column widths are tracked while the rows are grouped, so the
+                # tables do not need a second pass over their rows to size them
+                file_headers = ["File Path", "Status", "Latest Version", "Empty Status"]
+                changes_headers = file_headers + ["Changes"]
+                different_content_widths = [len(h) for h in changes_headers]
+                identical_widths = [len(h) for h in file_headers]
+                not_compared_widths = [len(h) for h in file_headers]
+                only_in_project1_widths = [len(h) for h in file_headers]
+                only_in_project2_widths = [len(h) for h in file_headers]
+                
+                def add_row(rows, col_widths, row):
+                    rows.append(row)
+                    for i, cell in enumerate(row):
+                        if len(cell) > col_widths[i]:
+                            col_widths[i] = len(cell)
                 
-                for file_path, comparison in self.comparison_report['file_comparison'].items():
+                for file_path, comparison in report['file_comparison'].items():
                     status = comparison['status']
                     latest = comparison.get('latest_version', 'N/A')
-                    empty_status = self._get_empty_status(
+                    empty_status = empty_statuses.get((
                         comparison.get('is_empty_project1', False),
                         comparison.get('is_empty_project2', False),
                         status
-                    )
+                    ), "N/A")
                     
                     if status == 'common':
-                        content_comp = comparison.get('content_comparison', {}) or {}
-                        if content_comp.get('identical'):
-                            identical_files.append([file_path, "IDENTICAL", latest, empty_status])
-                        elif content_comp.get('identical') is False:
+                        content_comp = comparison.get('content_comparison') or {}
+                        identical = content_comp.get('identical')
+                        if identical:
+                            add_row(identical_files, identical_widths,
+                                    [file_path, "IDENTICAL", latest, empty_status])
+                        elif identical is False:
+                            diff_entries.append((file_path, content_comp))
                             diff_info = content_comp.get('differences', {})
-                            changes = f"+{diff_info.get('added_lines', 0)} -{diff_info.get('removed_lines', 0)}"
-                            different_content_files.append([file_path, "DIFFERENT CONTENT", latest, empty_status, changes])
+                            if content_comp.get('diff_skipped'):
+                                changes = "Not diffed"
+                            else:
+                                changes = f"+{diff_info.get('added_lines', 0)} -{diff_info.get('removed_lines', 0)}"
+                            add_row(different_content_files, different_content_widths,
+                                    [file_path, "DIFFERENT CONTENT", latest, empty_status, changes])
                         else:
-                            not_compared_files.append([file_path, "COMMON (Not Compared)", latest, empty_status])
+                            add_row(not_compared_files, not_compared_widths,
+                                    [file_path, "COMMON (Not Compared)", latest, empty_status])
                     elif status == 'only_in_project1':
-                        only_in_project1_files.append([file_path, "ONLY IN PROJECT 1", latest, empty_status, ""])
+                        add_row(only_in_project1_files, only_in_project1_widths,
+                                [file_path, "ONLY IN PROJECT 1", latest, empty_status])
                     elif status == 'only_in_project2':
-                        only_in_project2_files.append([file_path, "ONLY IN PROJECT 2", latest, empty_status, ""])
+                        add_row(only_in_project2_files, only_in_project2_widths,
+                                [file_path, "ONLY IN PROJECT 2", latest, empty_status])
                 
                 # Write files with different content
                 if different_content_files:
-                    f.write("FILES WITH DIFFERENT CONTENT:\n")
-                    f.write("-" * 50 + "\n")
-                    f.write(self._format_table(
-                        ["File Path", "Status", "Latest Version", "Empty Status", "Changes"], 
-                        different_content_files
+                    write("FILES WITH DIFFERENT CONTENT:\n")
+                    write("-" * 50 + "\n")
+                    buf.extend(self._iter_table_lines(
+                        changes_headers, different_content_files, different_content_widths
                     ))
-                    f.write("\n")
+                    write("\n")
                 
                 # Write identical files
                 if identical_files:
-                    f.write("FILES WITH IDENTICAL CONTENT:\n")
-                    f.write("-" * 40 + "\n")
-                    f.write(self._format_table(
-                        ["File Path", "Status", "Latest Version", "Empty Status"], 
-                        identical_files
+                    write("FILES WITH IDENTICAL CONTENT:\n")
+                    write("-" * 40 + "\n")
+                    buf.extend(self._iter_table_lines(
+                        file_headers, identical_files, identical_widths
                     ))
-                    f.write("\n")
+                    write("\n")
                 
                 # Write common files not compared
                 if not_compared_files:
-                    f.write("COMMON FILES (Content Not Compared):\n")
-                    f.write("-" * 45 + "\n")
-                    f.write(self._format_table(
-                        ["File Path", "Status", "Latest Version", "Empty Status"], 
-                        not_compared_files
+                    write("COMMON FILES (Content Not Compared):\n")
+                    write("-" * 45 + "\n")
+                    buf.extend(self._iter_table_lines(
+                        file_headers, not_compared_files, not_compared_widths
                     ))
-                    f.write("\n")
+                    write("\n")
                 
                 # Write files only in project 1
                 if only_in_project1_files:
-                    f.write("FILES ONLY IN PROJECT 1:\n")
-                    f.write("-" * 30 + "\n")
-                    f.write(self._format_table(
-                        ["File Path", "Status", "Latest Version", "Empty Status", ""], 
-                        only_in_project1_files
+                    write("FILES ONLY IN PROJECT 1:\n")
+                    write("-" * 30 + "\n")
+                    buf.extend(self._iter_table_lines(
+                        file_headers, only_in_project1_files, only_in_project1_widths
                     ))
-                    f.write("\n")
+                    write("\n")
                 
                 # Write files only in project 2
                 if only_in_project2_files:
-                    f.write("FILES ONLY IN PROJECT 2:\n")
-                    f.write("-" * 30 + "\n")
-                    f.write(self._format_table(
-                        ["File Path", "Status", "Latest Version", "Empty Status", ""], 
-                        only_in_project2_files
+                    write("FILES ONLY IN PROJECT 2:\n")
+                    write("-" * 30 + "\n")
+                    buf.extend(self._iter_table_lines(
+                        file_headers, only_in_project2_files, only_in_project2_widths
                     ))
-                    f.write("\n")
+                    write("\n")
                 
                 if not any([different_content_files, identical_files, not_compared_files, 
                            only_in_project1_files, only_in_project2_files]):
-                    f.write("No files found for comparison.\n")
+                    write("No files found for comparison.\n")
+                
+                flush_section()
                 
                 # Detailed File Differences Section
-                f.write("\n" + "="*80 + "\n")
-                f.write("DETAILED FILE DIFFERENCES\n")
-                f.write("="*80 + "\n\n")
+                write("\n" + "="*80 + "\n")
+                write("DETAILED FILE DIFFERENCES\n")
+                write("="*80 + "\n\n")
                 
-                files_with_differences = 0
-                for file_path, comparison in self.comparison_report['file_comparison'].items():
-                    if (comparison['status'] == 'common' and 
-                        comparison.get('content_comparison') and 
-                        comparison['content_comparison'].get('identical') is False):
-                        
-                        files_with_differences += 1
-                        f.write(f"File: {file_path}\n")
-                        f.write("-" * (len(file_path) + 6) + "\n")
-                        
-                        diff_output = comparison['content_comparison'].get('diff_output', [])
-                        lines_shown = 0
-                        for line in diff_output:
-                            if line.startswith('+ ') or line.startswith('- '):
-                                if lines_shown < 50:  # Show first 50 differences
-                                    if line.startswith('+ '):
-                                        f.write(f"  + {line[2:]}")
-                                    elif line.startswith('- '):
-                                        f.write(f"  - {line[2:]}")
-                                    lines_shown += 1
-                        
-                        if len(diff_output) > 50:
-                            f.write(f"  ... and {len(diff_output) - 50} more differences\n")
-                        
-                        f.write("\n" + "-"*80 + "\n\n")
+                for file_path, content_comp in diff_entries:
+                    # The underline is cut from a prebuilt run of dashes
+                    # rather than multiplied out for every file
+                    underline = len(file_path) + 6
+                    write(f"File: {file_path}\n")
+                    write(DASHES[:underline] if underline <= len(DASHES) else "-" * underline)
+                    write("\n")
+                    
+                    if content_comp.get('diff_skipped'):
+                        write(f"  (Larger than {MAX_DIFF_BYTES} bytes, contents differ but were not diffed)\n")
+                    
+                    # The diff lines are read back from the file they were streamed to
+                    diff_file = content_comp.get('diff_file')
+                    diff_lines = content_comp.get('diff_lines', 0)
+                    if diff_file:
+                        with open(diff_file, 'r', encoding='utf-8') as diff_output:
+                            # Show first 50 differences, without reading the rest of the file
+                            changed_lines = (line for line in diff_output if line.startswith(DIFF_CHANGE_PREFIXES))
+                            # Lines keep their own '+ ' or '- ' prefix, so each one is
+                            # appended as is after the indent rather than rebuilt
+                            for line in islice(changed_lines, 50):
+                                write("  ")
+                                write(line)
+                    
+                    if diff_lines > 50:
+                        write(f"  ... and {diff_lines - 50} more differences\n")
+                    
+                    write(DIFF_ENTRY_SEPARATOR)
+                    flush_section()
                 
-                if files_with_differences == 0:
-                    f.write("No files with content differences found.\n")
+                if not diff_entries:
+                    write("No files with content differences found.\n")
+                flush_section()
             
-            self.logger.info(f"Comparison report generated: {report_file}")
+            self.logger.info("Comparison report generated: %s", report_file)
             return str(report_file)
             
         except Exception as e:
-            self.logger.error(f"Error generating report: {str(e)}")
+            self.logger.error("Error generating report: %s", e)
             raise
     
     def save_json_report(self) -> str:
@@ -863,22 +1283,42 @@ class ProjectComparator:
         json_report_file = script_dir / "project_comparison_detailed.json"
         
         try:
-            with open(json_report_file, 'w', encoding='utf-8') as f:
-                json.dump(self.comparison_report, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(self.comparison_report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+            else:
+                data = json.dumps(self.comparison_report, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(json_report_file, 'wb') as f:
+                f.write(data)
             
-            self.logger.info(f"JSON report saved: {json_report_file}")
+            self.logger.info("JSON report saved: %s", json_report_file)
+            self._flush_log()
             return str(json_report_file)
             
         except Exception as e:
-            self.logger.error(f"Error saving JSON report: {str(e)}")
+            self.logger.error("Error saving JSON report: %s", e)
             raise
 
 
 # Example usage and demonstration
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Example usage of the ProjectComparator class with exclusion support.
+    
+    When both project paths are given on the command line the comparison runs
+    without any prompts, so it can be scripted.
     """
+    parser = argparse.ArgumentParser(description="Compare the structure and file contents of two projects.")
+    parser.add_argument('--project1', help="Path to the first project")
+    parser.add_argument('--project2', help="Path to the second project")
+    parser.add_argument('--exclude-dirs', nargs='*', help="Directory names to exclude (replaces the defaults)")
+    parser.add_argument('--exclude-files', nargs='*', help="File names to exclude (replaces the defaults)")
+    parser.add_argument('--exclude-extensions', nargs='*', help="File extensions to exclude (replaces the defaults)")
+    args = parser.parse_args(argv)
+    
+    if (args.project1 is None) != (args.project2 is None):
+        parser.error("--project1 and --project2 must be given together")
+    interactive = args.project1 is None
+    
     # Default project paths (can be modified by user)
     # Using forward slashes or raw strings to avoid escape issues
     default_project1 = r"C:\Users\user\Desktop\dir\d1"
@@ -887,19 +1327,23 @@ def main():
     print("PROJECT COMPARISON TOOL")
     print("=" * 50)
     
-    # Project path selection
-    print(f"\nCurrent default project paths:")
-    print(f"Project 1: {default_project1}")
-    print(f"Project 2: {default_project2}")
-    
-    use_default = input("\nUse default project paths? (y/n): ").strip().lower()
-    
-    if use_default == 'y':
-        project1 = default_project1
-        project2 = default_project2
+    if not interactive:
+        project1 = args.project1
+        project2 = args.project2
     else:
-        project1 = input("Enter path to first project: ").strip()
-        project2 = input("Enter path to second project: ").strip()
+        # Project path selection
+        print(f"\nCurrent default project paths:")
+        print(f"Project 1: {default_project1}")
+        print(f"Project 2: {default_project2}")
+        
+        use_default = input("\nUse default project paths? (y/n): ").strip().lower()
+        
+        if use_default == 'y':
+            project1 = default_project1
+            project2 = default_project2
+        else:
+            project1 = input("Enter path to first project: ").strip()
+            project2 = input("Enter path to second project: ").strip()
     
     # Define default exclusions
     exclude_dirs = {
@@ -916,31 +1360,41 @@ def main():
         '.log', '.tmp', '.temp', '.cache'
     }
     
+    # Exclusions given on the command line replace the defaults
+    if args.exclude_dirs is not None:
+        exclude_dirs = set(args.exclude_dirs)
+    if args.exclude_files is not None:
+        exclude_files = set(args.exclude_files)
+    if args.exclude_extensions is not None:
+        exclude_extensions = set(args.exclude_extensions)
+    
+    # Sorted once, for both the settings display and the prompts below
+    current_dirs = ', '.join(sorted(exclude_dirs))
+    current_files = ', '.join(sorted(exclude_files))
+    current_extensions = ', '.join(sorted(exclude_extensions))
+    
     # Allow user to modify exclusions
     print("\nCurrent exclusion settings:")
-    print(f"Directories: {', '.join(sorted(exclude_dirs))}")
-    print(f"Files: {', '.join(sorted(exclude_files))}")
-    print(f"Extensions: {', '.join(sorted(exclude_extensions))}")
+    print(f"Directories: {current_dirs}")
+    print(f"Files: {current_files}")
+    print(f"Extensions: {current_extensions}")
     
-    modify_exclusions = input("\nDo you want to modify exclusion settings? (y/n): ").strip().lower()
+    modify_exclusions = input("\nDo you want to modify exclusion settings? (y/n): ").strip().lower() if interactive else 'n'
     
     if modify_exclusions == 'y':
         print("\nModify exclusions (press Enter to keep current):")
         
         # Directories
-        current_dirs = ', '.join(sorted(exclude_dirs))
         new_dirs = input(f"Excluded directories [{current_dirs}]: ").strip()
         if new_dirs:
             exclude_dirs = set([d.strip() for d in new_dirs.split(',') if d.strip()])
         
         # Files
-        current_files = ', '.join(sorted(exclude_files))
         new_files = input(f"Excluded files [{current_files}]: ").strip()
         if new_files:
             exclude_files = set([f.strip() for f in new_files.split(',') if f.strip()])
         
         # Extensions
-        current_extensions = ', '.join(sorted(exclude_extensions))
         new_extensions = input(f"Excluded extensions [{current_extensions}]: ").strip()
         if new_extensions:
             exclude_extensions = set([e.strip() for e in new_extensions.split(',') if e.strip()])
@@ -973,6 +1427,7 @@ def main():
         print(f"Text report: {text_report}")
         print(f"JSON report: {json_report}")
         print(f"Debug logs: {script_dir / 'project_comparison_debug.log'}")
+        print(f"Line diffs: {comparator.diffs_dir}")
         print(f"\nAll output files are saved in: {script_dir}")
         
         # Show summary
@@ -1,132 +1,513 @@
+import fnmatch
+import mmap
 import os
+import re
 import sys
-from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import BinaryIO, Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple
 
+# Files larger than this are streamed in chunks of this size instead of
+# being read into memory whole
+READ_CHUNK_SIZE = 1 << 20
 
-def ProjectStructureGenerator(root_dir, prefix="", exclude_dirs=None, exclude_files=None):
+# Reports are saved next to this script as
+# "<root name>_directory_structure_<timestamp>.txt"
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_NAME_TAG = "_directory_structure_"
+
+# Directories never descended into when searching for the parent directory
+SEARCH_SKIP_DIRS = {"__pycache__", ".git", "node_modules"}
+
+BINARY_PLACEHOLDER = b"[BINARY FILE - CONTENTS NOT SHOWN]"
+
+
+def _encode(text: str) -> bytes:
     """
-    Generate a visual tree structure of the directory with file names.
-    Skips __pycache__ directories and their contents, plus any excluded directories/files.
+    Encode report text to UTF-8. Undecodable file names (surrogate-escaped
+    by the OS layer) are written back as their original bytes.
+    """
+    return text.encode("utf-8", "surrogateescape")
+
+
+def iter_project_structure(
+    root_dir: str,
+    prefix: str = "",
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the visual tree structure of the directory as UTF-8 chunks.
+    Joining the chunks gives the same text as ProjectStructureGenerator.
     """
     if exclude_dirs is None:
         exclude_dirs = set()
     if exclude_files is None:
         exclude_files = set()
 
-    root_path = Path(root_dir)
-    output = []
+    # Path exclusions are resolved once up front; the name checks below are
+    # plain set lookups and the path check is skipped when none were given
+    excluded_dir_names, excluded_dir_paths = _split_exclusions(exclude_dirs, root_dir)
+    excluded_file_names, excluded_file_paths = _split_exclusions(exclude_files, root_dir)
+    excluded_paths = excluded_dir_paths | excluded_file_paths
+    is_excluded_file = _name_matcher(excluded_file_names)
+
+    # Lines are separated (not terminated) by newlines
+    sep = ""
 
     # Add the root directory name only if it's the initial call
     if prefix == "":
-        output.append(f"{root_path.name}/")
+        yield _encode(f"{os.path.basename(os.path.normpath(root_dir))}/")
+        sep = "\n"
+
+    # Walk iteratively instead of recursing so deep trees cannot hit the
+    # recursion limit. Each frame is (line to emit, directory to expand,
+    # prefix for that directory's children); the line or the directory may
+    # be None. Frames are pushed in reverse so they pop off in display order.
+    stack: Deque[Tuple[Optional[str], Optional[str], str]] = deque([(None, root_dir, prefix)])
+    while stack:
+        line, dir_path, dir_prefix = stack.pop()
+        if line is not None:
+            yield _encode(sep + line)
+            sep = "\n"
+        if dir_path is None:
+            continue
+
+        # os.scandir hands back DirEntry objects whose is_dir()/is_file() reuse
+        # the type information from readdir, so no extra stat() is needed per item
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except PermissionError:
+            yield _encode(
+                f"{sep}{dir_prefix}{os.path.basename(os.path.normpath(dir_path))}/ [Permission Denied]"
+            )
+            sep = "\n"
+            continue
+
+        # Filter out excluded items and separate directories and files in a
+        # single pass over the entries
+        dirs = []
+        files = []
+        in_script_dir = os.path.abspath(dir_path) == SCRIPT_DIR
+        for e in entries:
+            name = e.name
+            if (
+                name == "__pycache__"
+                or name in excluded_dir_names
+                or is_excluded_file(name)
+                or (excluded_paths and e.path in excluded_paths)
+            ):
+                continue
+            if e.is_dir(follow_symlinks=False):
+                dirs.append(e)
+            elif e.is_symlink() and e.is_dir():
+                # Symlinked directories are listed but not descended into,
+                # so a link back up the tree cannot loop
+                dirs.append(e)
+            elif e.is_file() and not (in_script_dir and _is_report_file(name)):
+                files.append(e)
+
+        frames: List[Tuple[Optional[str], Optional[str], str]] = []
+
+        # Process directories first
+        for i, dir_entry in enumerate(dirs):
+            is_last_dir = (i == len(dirs) - 1) and (len(files) == 0)
+            expand = None if dir_entry.is_symlink() else dir_entry.path
+
+            if is_last_dir:
+                frames.append(
+                    (f"{dir_prefix}└── {dir_entry.name}/", expand, dir_prefix + "    ")
+                )
+            else:
+                frames.append(
+                    (f"{dir_prefix}├── {dir_entry.name}/", expand, dir_prefix + "│   ")
+                )
+
+        # Process files
+        for i, file_entry in enumerate(files):
+            is_last_file = i == len(files) - 1
+
+            if is_last_file:
+                frames.append((f"{dir_prefix}└── {file_entry.name}", None, ""))
+            else:
+                frames.append((f"{dir_prefix}├── {file_entry.name}", None, ""))
+
+        stack.extend(reversed(frames))
+
+
+def ProjectStructureGenerator(
+    root_dir: str,
+    prefix: str = "",
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+) -> str:
+    """
+    Generate a visual tree structure of the directory with file names.
+    Skips __pycache__ directories and their contents, plus any excluded directories/files.
+    """
+    return b"".join(
+        iter_project_structure(root_dir, prefix, exclude_dirs, exclude_files)
+    ).decode("utf-8", "surrogateescape")
 
-    try:
-        items = sorted(os.listdir(root_dir))
-    except PermissionError:
-        return f"{prefix}{root_path.name}/ [Permission Denied]"
-
-    # Filter out excluded items
-    items = [
-        item
-        for item in items
-        if item != "__pycache__"
-        and item not in exclude_dirs
-        and item not in exclude_files
-    ]
-
-    # Separate directories and files
-    dirs = [item for item in items if os.path.isdir(os.path.join(root_dir, item))]
-    files = [item for item in items if os.path.isfile(os.path.join(root_dir, item))]
-
-    # Process directories first
-    for i, dir_name in enumerate(dirs):
-        dir_path = os.path.join(root_dir, dir_name)
-        is_last_dir = (i == len(dirs) - 1) and (len(files) == 0)
-
-        if is_last_dir:
-            new_prefix = prefix + "    "
-            output.append(f"{prefix}└── {dir_name}/")
+
+def _is_report_file(name: str) -> bool:
+    """
+    Check whether a file name looks like a report written by main().
+    """
+    return OUTPUT_NAME_TAG in name and name.endswith(".txt")
+
+
+def _scan_tree(root_dir: str) -> Iterator[Tuple[str, List["os.DirEntry[str]"], List["os.DirEntry[str]"]]]:
+    """
+    Top-down directory walk in the same order as os.walk, but yielding
+    (dirpath, dir_entries, file_entries) lists of os.DirEntry objects so
+    callers can use entry.name/entry.path without joining or re-statting.
+    Like os.walk, dir_entries may be pruned in place to skip subtrees, and
+    symlinked directories are listed but not descended into.
+    """
+    stack: List[str] = [root_dir]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        dir_entries: List["os.DirEntry[str]"] = []
+        file_entries: List["os.DirEntry[str]"] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dir_entries if is_dir else file_entries).append(entry)
+
+        yield dirpath, dir_entries, file_entries
+
+        for entry in reversed(dir_entries):
+            if not entry.is_symlink():
+                stack.append(entry.path)
+
+
+def _name_matcher(names: Iterable[str]) -> Callable[[str], bool]:
+    """
+    Return a predicate telling whether a name matches any entry in names.
+    Entries with glob characters (e.g. '*.log', 'temp_*.txt') are compiled
+    into a single regex; the rest are matched exactly with a set lookup.
+    """
+    literals: Set[str] = set()
+    patterns: List[str] = []
+    for name in names:
+        if any(c in name for c in "*?["):
+            patterns.append(name)
         else:
-            new_prefix = prefix + "│   "
-            output.append(f"{prefix}├── {dir_name}/")
+            literals.add(name)
 
-        # Recursively process subdirectories
-        output.append(
-            ProjectStructureGenerator(dir_path, new_prefix, exclude_dirs, exclude_files)
-        )
+    if not patterns:
+        return literals.__contains__
+
+    pattern_match = re.compile("|".join(fnmatch.translate(p) for p in patterns)).match
+
+    def is_excluded(name: str) -> bool:
+        return name in literals or pattern_match(name) is not None
+
+    return is_excluded
 
-    # Process files
-    for i, file_name in enumerate(files):
-        is_last_file = i == len(files) - 1
 
-        if is_last_file:
-            output.append(f"{prefix}└── {file_name}")
+def _split_exclusions(excludes: Iterable[str], root_dir: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Split an exclusion set into bare names and full paths.
+    Entries containing a path separator are treated as paths (relative ones
+    are resolved against root_dir) and normalised once, so the walk can match
+    them against DirEntry.path with a single set lookup.
+    """
+    seps = (os.sep, os.altsep) if os.altsep else (os.sep,)
+    names: Set[str] = set()
+    paths: Set[str] = set()
+    for item in excludes:
+        if any(sep in item for sep in seps):
+            paths.add(os.path.normpath(os.path.join(root_dir, item)))
         else:
-            output.append(f"{prefix}├── {file_name}")
+            names.add(item)
+    return names, paths
+
 
-    return "\n".join([line for line in output if line is not None])
+def _normalize_newlines(data: bytes) -> bytes:
+    """
+    Translate \r\n and \r to \n, as reading in text mode would.
+    Safe on UTF-8 bytes, where CR/LF never occur inside a multi-byte sequence.
+    """
+    if b"\r" in data:
+        data = data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    return data
 
 
-def get_file_contents(root_dir, exclude_dirs=None, exclude_files=None):
+def _complete_utf8_prefix(data: bytes) -> int:
     """
-    Generate the contents of all files with clear start/end markers.
-    Skips __pycache__ directories and excluded directories/files.
-    Includes full relative path from root directory in the file marker.
+    Return the length of data without a trailing, incomplete UTF-8 sequence,
+    so a chunk can be validated on its own and the remainder carried over.
+    """
+    n = len(data)
+    for k in range(1, min(4, n) + 1):
+        byte = data[n - k]
+        if byte < 0x80:
+            return n
+        if byte >= 0xC0:
+            needed = 2 if byte < 0xE0 else 3 if byte < 0xF0 else 4
+            return n if k >= needed else n - k
+    return n
+
+
+def _read_file(filepath: str) -> Optional[bytes]:
+    """
+    Read a single file for get_file_contents.
+    Returns the file's UTF-8 bytes, or a placeholder for binary/unreadable files.
+    Returns None for files larger than READ_CHUNK_SIZE; those are streamed
+    with _iter_large_file instead of being loaded whole.
+    """
+    try:
+        # The whole file is read in one go, so skip the BufferedReader layer.
+        # The bytes are only validated as UTF-8 (pure ASCII needs no check)
+        # and then written through as-is, never decoded and re-encoded.
+        with open(filepath, "rb", buffering=0) as f:
+            if os.fstat(f.fileno()).st_size > READ_CHUNK_SIZE:
+                return None
+            raw = f.read()
+        if not raw.isascii():
+            raw.decode("utf-8")
+        return _normalize_newlines(raw)
+    except UnicodeDecodeError:
+        return BINARY_PLACEHOLDER
+    except Exception as e:
+        return _encode(f"[ERROR READING FILE: {str(e)}]")
+
+
+def _iter_file_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """
+    Yield the contents of the open binary file f in READ_CHUNK_SIZE pieces.
+    The file is memory-mapped when possible so the kernel pages it in on
+    demand (with sequential read-ahead) instead of going through read().
+    """
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        # Empty or unmappable (e.g. special) files fall back to plain reads
+        yield from iter(lambda: f.read(READ_CHUNK_SIZE), b"")
+        return
+
+    with mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        for start in range(0, len(mm), READ_CHUNK_SIZE):
+            yield mm[start:start + READ_CHUNK_SIZE]
+
+
+def _is_utf8_file(f: BinaryIO) -> bool:
+    """
+    Return whether the whole of the open binary file f is valid UTF-8.
+    The file is checked one chunk at a time, so it is never held in memory whole.
+    """
+    carry = b""
+    for raw in _iter_file_chunks(f):
+        data = carry + raw if carry else raw
+        cut = _complete_utf8_prefix(data)
+        data, carry = data[:cut], data[cut:]
+        if not data.isascii():
+            try:
+                data.decode("utf-8")
+            except UnicodeDecodeError:
+                return False
+    # A character cut short at the end of the file is not valid UTF-8 either
+    return not carry
+
+
+def _iter_large_file(filepath: str) -> Iterator[bytes]:
+    """
+    Yield the UTF-8 bytes of a large file in READ_CHUNK_SIZE pieces so only
+    one chunk is held in memory at a time.
+    The whole file is validated before anything is yielded, so a file with
+    undecodable bytes anywhere in it is reported as binary, as a small file is.
+    """
+    # A trailing \r is held back in case the next chunk starts with \n
+    pending_cr = False
+    try:
+        with open(filepath, "rb", buffering=0) as f:
+            if not _is_utf8_file(f):
+                yield BINARY_PLACEHOLDER
+                return
+            # Already validated, so the chunks are written through as-is; a
+            # character split across two chunks is rejoined in the output
+            f.seek(0)
+            for data in _iter_file_chunks(f):
+                if pending_cr:
+                    data = b"\r" + data
+                pending_cr = data.endswith(b"\r")
+                if pending_cr:
+                    data = data[:-1]
+                if data:
+                    yield _normalize_newlines(data)
+
+        if pending_cr:
+            yield b"\n"
+    except Exception as e:
+        yield _encode(f"[ERROR READING FILE: {str(e)}]")
+
+
+def iter_file_contents(
+    root_dir: str,
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the contents of all files with start/end markers as UTF-8 chunks.
+    Joining the chunks gives the same text as get_file_contents.
     """
     if exclude_dirs is None:
         exclude_dirs = set()
     if exclude_files is None:
         exclude_files = set()
 
-    output = []
-    root_dir_name = os.path.basename(root_dir)
+    # One entry per file in the tree, only ever appended to and iterated, so
+    # a deque avoids the list's resize-and-copy as it grows on large repos
+    files_to_read: Deque[Tuple[str, str, str, str]] = deque()
+    excluded_dir_names, excluded_dir_paths = _split_exclusions(exclude_dirs, root_dir)
+    excluded_file_names, excluded_file_paths = _split_exclusions(exclude_files, root_dir)
+    is_excluded_file = _name_matcher(excluded_file_names)
+
+    # Bind the os.path helpers used per item to locals, and compute the
+    # loop-invariant paths once rather than on every iteration
+    _relpath = os.path.relpath
+    _abspath = os.path.abspath
+    rel_start = os.path.dirname(root_dir)
 
-    for dirpath, dirnames, filenames in os.walk(root_dir):
+    for dirpath, dir_entries, file_entries in _scan_tree(root_dir):
         # Skip __pycache__ and excluded directories
-        dirnames[:] = [
+        dir_entries[:] = [
             d
-            for d in dirnames
-            if d != "__pycache__"
-            and d not in exclude_dirs
-            and os.path.join(dirpath, d) not in exclude_dirs
+            for d in dir_entries
+            if d.name != "__pycache__"
+            and d.name not in excluded_dir_names
+            and (not excluded_dir_paths or d.path not in excluded_dir_paths)
         ]
 
-        # Skip the output file if it exists in the directory
-        if os.path.basename(dirpath) == os.path.dirname(os.path.abspath(__file__)):
-            filenames = [f for f in filenames if f != "directory_structure_output.txt"]
+        # Skip our own reports (including the one being written) if the walk
+        # passes through the script directory
+        if _abspath(dirpath) == SCRIPT_DIR:
+            file_entries = [f for f in file_entries if not _is_report_file(f.name)]
 
         # Filter out excluded files
-        filenames = [
+        file_entries = [
             f
-            for f in filenames
-            if f not in exclude_files and os.path.join(dirpath, f) not in exclude_files
+            for f in file_entries
+            if not is_excluded_file(f.name)
+            and (not excluded_file_paths or f.path not in excluded_file_paths)
         ]
 
-        if filenames:
-            output.append(f"\n\n=== Directory: {dirpath} ===\n")
+        for file_entry in file_entries:
+            # Get relative path from root directory
+            rel_path = _relpath(file_entry.path, start=rel_start)
+            files_to_read.append((dirpath, file_entry.path, rel_path, file_entry.name))
+
+    # Reading is dominated by I/O wait, which releases the GIL, so the reads are
+    # overlapped on a thread pool. Only a bounded window of reads is in flight
+    # at once so finished-but-unwritten files do not pile up in memory, and
+    # results are consumed in walk order.
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending_items = iter(files_to_read)
+        in_flight = deque(
+            (item, executor.submit(_read_file, item[1]))
+            for item in islice(pending_items, max_workers * 2)
+        )
 
-            for filename in filenames:
-                filepath = os.path.join(dirpath, filename)
-                # Get relative path from root directory
-                rel_path = os.path.relpath(filepath, start=os.path.dirname(root_dir))
-                output.append(f"\n────── FILE START: {filename} ({rel_path}) ──────\n")
+        # Every chunk after the first is preceded by a newline separator;
+        # file contents are yielded on their own so they are never copied
+        current_dir = None
+        sep = ""
+        while in_flight:
+            (dirpath, filepath, rel_path, filename), future = in_flight.popleft()
+            item = next(pending_items, None)
+            if item is not None:
+                in_flight.append((item, executor.submit(_read_file, item[1])))
+
+            if dirpath != current_dir:
+                yield _encode(f"{sep}\n\n=== Directory: {dirpath} ===\n")
+                current_dir = dirpath
+                sep = "\n"
+
+            yield _encode(f"\n\n────── FILE START: {filename} ({rel_path}) ──────\n")
+            yield b"\n"
+            contents = future.result()
+            if contents is None:
+                yield from _iter_large_file(filepath)
+            else:
+                yield contents
+            yield _encode(f"\n\n────── FILE END: {filename} ({rel_path}) ──────")
+
+
+def get_file_contents(
+    root_dir: str,
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+) -> str:
+    """
+    Generate the contents of all files with clear start/end markers.
+    Skips __pycache__ directories and excluded directories/files.
+    Includes full relative path from root directory in the file marker.
+    """
+    return b"".join(
+        iter_file_contents(root_dir, exclude_dirs, exclude_files)
+    ).decode("utf-8", "surrogateescape")
 
-                try:
-                    with open(filepath, "r", encoding="utf-8") as f:
-                        contents = f.read()
-                    output.append(contents)
-                    output.append(f"\n────── FILE END: {filename} ({rel_path}) ──────")
-                except UnicodeDecodeError:
-                    output.append("[BINARY FILE - CONTENTS NOT SHOWN]")
-                    output.append(f"\n────── FILE END: {filename} ({rel_path}) ──────")
-                except Exception as e:
-                    output.append(f"[ERROR READING FILE: {str(e)}]")
-                    output.append(f"\n────── FILE END: {filename} ({rel_path}) ──────")
 
-    return "\n".join(output)
+def iter_report(
+    root_dir: str,
+    exclude_dirs: Optional[Set[str]] = None,
+    exclude_files: Optional[Set[str]] = None,
+) -> Iterator[bytes]:
+    """
+    Yield the complete report (tree followed by file contents) as UTF-8 chunks.
+    """
+    yield _encode(f"Directory Structure for: {root_dir}\n\n")
+    yield from iter_project_structure(
+        root_dir, exclude_dirs=exclude_dirs, exclude_files=exclude_files
+    )
+    yield b"\n\n" + b"=" * 80 + b"\n\n"
+    yield b"FILE CONTENTS\n"
+    yield from iter_file_contents(
+        root_dir, exclude_dirs=exclude_dirs, exclude_files=exclude_files
+    )
 
 
-def get_exclusion_list(prompt):
+def _find_dir(start: str, name: str) -> Optional[str]:
+    """
+    Find the first directory called name under start, in the same top-down
+    order as os.walk, stopping at the first hit.
+    Directories in SEARCH_SKIP_DIRS are not searched.
+    """
+    stack = [start]
+    while stack:
+        current = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if not entry.is_dir():
+                        continue
+                    if entry.name == name:
+                        return entry.path
+                    if entry.name not in SEARCH_SKIP_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+    return None
+
+
+def get_exclusion_list(prompt: str) -> Set[str]:
     """
     Helper function to get a list of items to exclude from user input.
     """
@@ -136,7 +517,7 @@ def get_exclusion_list(prompt):
     return set(item.strip() for item in items.split(",") if item.strip())
 
 
-def main():
+def main() -> None:
     import datetime
 
     # Get the parent directory from user input
@@ -147,14 +528,9 @@ def main():
         parent_dir = parent_dir_input
     else:
         # Search for directory by name under base path
-        script_base_dir = os.path.dirname(os.path.abspath(__file__))
-        found_path = None
-        for root, dirs, _ in os.walk(script_base_dir):
-            if parent_dir_input in dirs:
-                found_path = os.path.join(root, parent_dir_input)
-                break
+        found_path = _find_dir(SCRIPT_DIR, parent_dir_input)
         if not found_path:
-            print(f"Error: Directory '{parent_dir_input}' not found under {script_base_dir}.")
+            print(f"Error: Directory '{parent_dir_input}' not found under {SCRIPT_DIR}.")
             sys.exit(1)
         parent_dir = found_path
 
@@ -166,30 +542,22 @@ def main():
     # Get the absolute path
     parent_dir = os.path.abspath(parent_dir)
 
-    # Generate the output
-    output = f"Directory Structure for: {parent_dir}\n\n"
-    output += ProjectStructureGenerator(
-        parent_dir, exclude_dirs=exclude_dirs, exclude_files=exclude_files
-    )
-    output += "\n\n" + "=" * 80 + "\n\n"
-    output += "FILE CONTENTS\n"
-    output += get_file_contents(
-        parent_dir, exclude_dirs=exclude_dirs, exclude_files=exclude_files
-    )
-
     # Prepare output file path and name
-    script_dir = os.path.dirname(os.path.abspath(__file__))  # save in script's dir
     dir_name_only = os.path.basename(parent_dir)  # just folder name
     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(
-        script_dir,
-        f"{dir_name_only}_directory_structure_{timestamp}.txt"
+        SCRIPT_DIR,  # save in script's dir
+        f"{dir_name_only}{OUTPUT_NAME_TAG}{timestamp}.txt"
     )
 
-    # Save to file
+    # Generate the output and stream it straight to the file through a 1 MiB
+    # buffer, so the whole report is never held in memory at once. The report
+    # chunks are already UTF-8 bytes and go to writelines as they are.
     try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(output)
+        with open(output_file, "wb", buffering=1 << 20) as f:
+            f.writelines(
+                iter_report(parent_dir, exclude_dirs=exclude_dirs, exclude_files=exclude_files)
+            )
         print(f"Directory structure and contents saved to {output_file}")
     except Exception as e:
         print(f"Error saving output file: {str(e)}")
@@ -1,10 +1,100 @@
 import os
+import sys
 import re
+import mmap
 import shutil
-from pathlib import Path
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, List, Optional, Tuple, Union
 import logging
 
+# Markers around each file section:
+# ────── FILE START: filename (filepath) ──────
+# ────── FILE END: filename (filepath) ──────
+# Kept as bytes so they can be searched for directly in the memory-mapped
+# source file.
+FILE_START_MARKER = '────── FILE START:'.encode('utf-8')
+FILE_END_MARKER = '────── FILE END: '.encode('utf-8')
+
+# Patterns are bytes so they can run directly over the memory-mapped source file
+ROOT_DIRECTORY_RE = re.compile(rb'Directory Structure for:\s*(.+)')
+FILE_PATH_RE = re.compile(rb'FILE START:.*?\((.+?)\)')
+
+# Flags for creating recreated files; O_BINARY keeps Windows from
+# translating newlines, which _encode_text has already done
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+
+# Paths may use Windows or Unix-style separators. One of the two already is
+# os.sep, so a single replace of the other normalizes a path; this is far
+# faster than str.translate, which has no fast path for such a table.
+FOREIGN_SEPARATOR = '/' if os.sep == '\\' else '\\'
+
+
+def _decode_text(data: bytes) -> str:
+    """Decode UTF-8 bytes with the same newline translation as text mode reads"""
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+
+
+# The ASCII characters str.strip() treats as whitespace
+ASCII_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+
+def _section_content(source: Union[bytes, mmap.mmap], start: int, end: int) -> Union[bytes, memoryview]:
+    """
+    Turn the bytes of source between a section header and its end marker
+    into the stripped, encoded file content.
+    Surrounding ASCII whitespace is skipped by moving the offsets. If what is
+    left starts and ends with ASCII characters and has no carriage returns,
+    stripping and newline translation would not change it, so a memoryview
+    into source is returned instead of a copy. Anything else is decoded,
+    stripped and encoded again.
+    """
+    while start < end and source[start] in ASCII_WHITESPACE:
+        start += 1
+    while end > start and source[end - 1] in ASCII_WHITESPACE:
+        end -= 1
+    if start == end:
+        return b''
+    if (source[start] < 0x80 and source[end - 1] < 0x80
+            and os.linesep == '\n' and source.find(b'\r', start, end) == -1):
+        return memoryview(source)[start:end]
+    return _encode_text(_decode_text(source[start:end]).strip())
+
+
+def _split_file_header(header: str) -> Tuple[str, str]:
+    """
+    Split a section header of the form "filename (filepath)" into its parts.
+    The file name may itself contain " (", so the split used is the first one
+    whose path ends with the name, falling back to the first " (". A header
+    without " (" is split at its last "(".
+    Returns: (filename, filepath)
+    Raises: ValueError if the header has no parenthesized path
+    """
+    if not header.endswith(')'):
+        raise ValueError(f"No file path in section header: {header}")
+    split_at = header.find(' (')
+    first_split = split_at
+    while split_at != -1:
+        if header[split_at + 2:-1].endswith(header[:split_at]):
+            break
+        split_at = header.find(' (', split_at + 2)
+    if split_at == -1:
+        split_at = first_split
+    if split_at == -1:
+        paren = header.rfind('(')
+        if paren == -1:
+            raise ValueError(f"No file path in section header: {header}")
+        return header[:paren].rstrip(), header[paren + 1:-1]
+    return header[:split_at], header[split_at + 2:-1]
+
+
+def _encode_text(text: str) -> bytes:
+    """Encode text as UTF-8 with the same newline translation as text mode writes"""
+    if os.linesep != '\n':
+        text = text.replace('\n', os.linesep)
+    return text.encode('utf-8')
+
+
 class ProjectRecreator:
     def __init__(self, source_file_path: str):
         # Get the directory where this script is located
@@ -16,7 +106,11 @@ class ProjectRecreator:
             
         self.source_file_path = source_file_path
         self.project_structure = {}
-        self.file_contents = {}
+        # File contents are held as encoded bytes, ready to be written. Most
+        # are memoryviews into the memory-mapped source file, which stays
+        # mapped until close() releases them, after create_project.
+        self.file_contents: Dict[str, Union[bytes, memoryview]] = {}
+        self.source_map: Optional[mmap.mmap] = None
         self.root_directory = ""
         self.setup_logging()
         
@@ -50,26 +144,35 @@ class ProjectRecreator:
                 self.logger.error(f"Files in directory: {os.listdir(self.script_dir)}")
                 return False
             
-            with open(self.source_file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
+            # The file is memory-mapped rather than read into a str, so pages
+            # are loaded as the parser scans them and file contents can be
+            # handed out as views into the mapping instead of copies
+            self.close()
+            content: Union[bytes, mmap.mmap]
+            with open(self.source_file_path, 'rb') as file:
+                if os.fstat(file.fileno()).st_size:
+                    content = self.source_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                else:
+                    # Empty files cannot be memory-mapped
+                    content = b''
             
             # Extract root directory from the first directory structure line
-            root_match = re.search(r'Directory Structure for:\s*(.+)', content)
+            root_match = ROOT_DIRECTORY_RE.search(content)
             if root_match:
-                original_path = root_match.group(1).strip()
+                original_path = _decode_text(root_match.group(1)).strip()
                 self.root_directory = os.path.basename(original_path)
                 self.logger.info(f"Found root directory: {self.root_directory}")
             else:
                 # Alternative: try to extract from file path patterns
-                file_paths = re.findall(r'FILE START:.*?\((.+?)\)', content)
-                if file_paths:
-                    first_file_dir = os.path.dirname(file_paths[0])
-                    if '\\' in first_file_dir:
-                        self.root_directory = first_file_dir.split('\\')[0]
-                    elif '/' in first_file_dir:
-                        self.root_directory = first_file_dir.split('/')[0]
-                    else:
-                        self.root_directory = "recreated_project"
+                file_path_match = FILE_PATH_RE.search(content)
+                if file_path_match:
+                    first_file_dir = os.path.dirname(_decode_text(file_path_match.group(1)))
+                    # Only the first component is needed, so partition instead
+                    # of splitting the whole path
+                    head, sep, _ = first_file_dir.partition('\\')
+                    if not sep:
+                        head, sep, _ = first_file_dir.partition('/')
+                    self.root_directory = head if sep and head else "recreated_project"
                     self.logger.info(f"Extracted root directory from file paths: {self.root_directory}")
                 else:
                     self.root_directory = "recreated_project"
@@ -85,100 +188,68 @@ class ProjectRecreator:
             self.logger.error(f"Error parsing source file: {str(e)}", exc_info=True)
             return False
 
-    def _parse_file_contents_robust(self, content: str):
-        """Parse file contents using robust method that handles all files"""
+    def _parse_file_contents_robust(self, content: Union[bytes, mmap.mmap]):
+        """
+        Parse file contents using robust method that handles all files
+        content is the memory-mapped source file, or b'' for an empty one;
+        both index to ints and slice and find alike, so either is scanned the same way
+        """
         self.logger.info("Parsing file contents with robust method...")
         
-        # Use regex to find all file sections
-        # Pattern: FILE START: filename (filepath) ------ content ------ FILE END: filename (filepath)
-        file_pattern = r'────── FILE START:\s*(.*?)\s*\((.*?)\)\s*─+\s*(.*?)\s*─+\s*FILE END:\s*\1\s*\(\2\)'
-        file_matches = re.findall(file_pattern, content, re.DOTALL)
-        
+        # Walk the file sections in a single pass over the content, finding
+        # each start marker, the end of its header line and then the matching
+        # end marker. The end marker repeats the header, so a file that itself
+        # contains "FILE END:" text for another file is not cut short. If no
+        # end marker repeats the header, the next FILE END marker of any kind
+        # closes the section.
+        # All searches run on the raw UTF-8 bytes; only headers and sections
+        # that need stripping or newline translation are ever decoded.
+        find = content.find
+        rfind = content.rfind
         files_parsed = 0
+        pos = 0
         
-        for match in file_matches:
-            try:
-                file_name = match[0].strip()
-                file_path = match[1].strip()
-                file_content = match[2].strip()
-                
-                self.file_contents[file_path] = file_content
-                files_parsed += 1
-                self.logger.debug(f"Parsed: {file_path} ({len(file_content)} chars)")
-                
-            except Exception as e:
-                self.logger.error(f"Error parsing file match: {str(e)}")
-                continue
-        
-        # If the above pattern didn't work, try alternative parsing
-        if files_parsed == 0:
-            self.logger.info("Trying alternative parsing method...")
-            self._parse_file_contents_alternative(content)
-        else:
-            self.logger.info(f"Successfully parsed {files_parsed} files using primary method")
-
-    def _parse_file_contents_alternative(self, content: str):
-        """Alternative parsing method for different file formats"""
-        # Split by file sections using the FILE START pattern
-        file_sections = re.split(r'=+\n\n────── FILE START:', content)
-        
-        # Handle the first section separately if it doesn't start with FILE START
-        if file_sections and not file_sections[0].startswith('FILE START:'):
-            # Check if first section contains any file content
-            if 'FILE START:' in file_sections[0]:
-                first_parts = file_sections[0].split('FILE START:', 1)
-                if len(first_parts) > 1:
-                    file_sections[0] = 'FILE START:' + first_parts[1]
-                else:
-                    file_sections = file_sections[1:]
-            else:
-                file_sections = file_sections[1:]
-        
-        files_parsed = 0
-        
-        for section in file_sections:
-            if not section.strip():
-                continue
-                
+        while True:
+            section_start = find(FILE_START_MARKER, pos)
+            if section_start == -1:
+                break
+            header_start = section_start + len(FILE_START_MARKER)
+            header_end = find(b'\n', header_start)
+            if header_end == -1:
+                break
+            pos = header_end + 1
+            
             try:
-                # Extract file path from the first line
-                first_line_end = section.find('\n')
-                if first_line_end == -1:
+                # The header runs up to the ')' closing the file path
+                header_close = rfind(b')', header_start, header_end)
+                if header_close == -1:
+                    self.logger.warning("Could not extract file path from: %s", _decode_text(content[header_start:header_end]).strip())
                     continue
-                    
-                header_line = section[:first_line_end].strip()
+                header = content[header_start:header_close + 1].strip()
                 
-                # Extract file path - looking for pattern like: main.py (f0\main.py)
-                file_path_match = re.search(r'\((.*?)\)', header_line)
-                if not file_path_match:
-                    self.logger.warning(f"Could not extract file path from: {header_line}")
+                end_marker = FILE_END_MARKER + header
+                section_end = find(end_marker, pos)
+                if section_end == -1:
+                    end_marker = FILE_END_MARKER
+                    section_end = find(end_marker, pos)
+                if section_end == -1:
+                    self.logger.warning("FILE END marker not found for: %s", _decode_text(header))
                     continue
-                    
-                file_path = file_path_match.group(1).strip()
                 
-                # Find the content between the header and FILE END
-                content_start = first_line_end + 1
-                content_end = section.find('────── FILE END:')
+                file_name, file_path = _split_file_header(_decode_text(header))
+                file_content = _section_content(content, pos, section_end)
                 
-                if content_end == -1:
-                    self.logger.warning(f"FILE END marker not found for: {file_path}")
-                    continue
-                
-                # Extract content
-                file_content = section[content_start:content_end].strip()
+                self.file_contents[file_path.strip()] = file_content
+                files_parsed += 1
+                self.logger.debug("Parsed: %s (%d bytes)", file_path, len(file_content))
                 
-                # Clean up any trailing path references
-                file_content = re.sub(r'\(.*?\)\s*$', '', file_content).strip()
+                pos = section_end + len(end_marker)
                 
-                self.file_contents[file_path] = file_content
-                files_parsed += 1
-                self.logger.debug(f"Parsed (alt): {file_path} ({len(file_content)} chars)")
-                    
             except Exception as e:
-                self.logger.error(f"Error parsing section: {str(e)}")
+                self.logger.error("Error parsing file section: %s", e)
                 continue
         
-        self.logger.info(f"Alternative method parsed {files_parsed} files")
+        self.logger.info(f"Successfully parsed {files_parsed} files")
 
     def get_unique_directory_name(self) -> str:
         """
@@ -189,7 +260,16 @@ class ProjectRecreator:
         counter = 1
         new_name = base_name
         
-        while os.path.exists(os.path.join(self.script_dir, new_name)):
+        # Read the directory once so names already taken are skipped without
+        # a stat each. normcase only folds case on Windows, so a candidate that
+        # misses the set is still checked with os.path.exists, which also
+        # catches a differently-cased match on case-insensitive macOS volumes
+        normcase = os.path.normcase
+        with os.scandir(self.script_dir) as entries:
+            existing_names = {normcase(entry.name) for entry in entries}
+        
+        while (normcase(new_name) in existing_names
+               or os.path.exists(os.path.join(self.script_dir, new_name))):
             new_name = f"{base_name}_{counter}"
             counter += 1
         
@@ -224,67 +304,103 @@ class ProjectRecreator:
         except Exception as e:
             self.logger.error(f"Error creating project: {str(e)}", exc_info=True)
             return False
+        finally:
+            # Unmap the source file as soon as it has been written out, so it
+            # is not held open (and locked on Windows) for the recreator's life
+            self.close()
+    
+    def close(self):
+        """
+        Release the parsed file contents and unmap the source file
+        The views into the mapping are released first, as a mapping with
+        views still exported cannot be closed
+        """
+        for content in self.file_contents.values():
+            if isinstance(content, memoryview):
+                content.release()
+        self.file_contents.clear()
+        if self.source_map is not None:
+            try:
+                self.source_map.close()
+            except BufferError as e:
+                # Someone else still holds a view; the mapping is then closed
+                # once that view is garbage collected
+                self.logger.warning("Source file still in use, not unmapped yet: %s", e)
+            self.source_map = None
     
     def _create_directories(self, target_root: str):
         """Create all necessary directories"""
         self.logger.info("Creating directory structure...")
         
-        # Extract all unique directories from file paths
-        all_directories = set()
+        # Bound once, as the loops below call them for every path
+        dirname = os.path.dirname
+        mkdir = os.mkdir
+        debug = self.logger.debug
+        sep = os.sep
+        # Paths below target_root are built by plain concatenation
+        root_prefix = os.path.join(target_root, '')
         
-        for file_path in self.file_contents.keys():
-            directory = os.path.dirname(file_path)
-            if directory:
-                # Handle both Windows and Unix-style paths
-                directory = directory.replace('\\', os.sep).replace('/', os.sep)
-                all_directories.add(directory)
+        # Extract all unique directories from file paths. Both Windows and
+        # Unix-style paths are handled: separators are normalized first so
+        # dirname also splits Windows-style paths on other platforms.
+        all_directories = {
+            dirname(file_path.replace(FOREIGN_SEPARATOR, sep))
+            for file_path in self.file_contents
+        }
+        all_directories.discard('')
         
-        # Create directories in sorted order (deepest first to ensure parent directories exist)
-        sorted_directories = sorted(all_directories, key=lambda x: x.count(os.sep))
+        # The target root is created up front as well, so files directly in
+        # it never need the makedirs fallback in _write_file
+        try:
+            os.makedirs(target_root, exist_ok=True)
+        except Exception as e:
+            self.logger.error("Failed to create directory %s: %s", target_root, e)
         
-        for directory in sorted_directories:
-            full_dir_path = os.path.join(target_root, directory)
+        # Add every parent directory as well, walking each parent chain
+        # until it reaches one already seen
+        parent_directories = set()
+        for directory in all_directories:
+            parent = dirname(directory)
+            while parent and parent not in parent_directories:
+                parent_directories.add(parent)
+                parent = dirname(parent)
+        
+        # A parent is a prefix of the directories in it, so in sorted order it
+        # always comes first and each directory needs just one mkdir, rather
+        # than makedirs checking every ancestor again
+        for directory in sorted(all_directories | parent_directories):
+            full_dir_path = root_prefix + directory
             try:
-                os.makedirs(full_dir_path, exist_ok=True)
-                self.logger.debug(f"Created directory: {full_dir_path}")
+                mkdir(full_dir_path)
+                debug("Created directory: %s", full_dir_path)
+            except FileExistsError:
+                pass
             except Exception as e:
-                self.logger.error(f"Failed to create directory {full_dir_path}: {str(e)}")
+                self.logger.error("Failed to create directory %s: %s", full_dir_path, e)
     
     def _create_files_complete(self, target_root: str):
         """Create all files with their complete contents without truncation"""
         self.logger.info(f"Creating {len(self.file_contents)} files with complete content...")
         
-        files_created = 0
-        files_failed = 0
+        # Writing is dominated by I/O wait, which releases the GIL, so the
+        # files are written on a thread pool
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        root_prefix = os.path.join(target_root, '')
+        # Files are handed out grouped by directory, so siblings are created
+        # close together while that directory's entries are still cached
+        items = sorted(
+            self.file_contents.items(),
+            key=lambda item: os.path.dirname(item[0].replace(FOREIGN_SEPARATOR, os.sep))
+        )
+        # _write_file returns True for every file it created, so the results
+        # are summed as they arrive instead of being collected in a list
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            files_created = sum(executor.map(
+                lambda item: self._write_file(root_prefix, *item),
+                items
+            ))
         
-        for file_path, content in self.file_contents.items():
-            try:
-                # Normalize path separators
-                normalized_path = file_path.replace('\\', os.sep).replace('/', os.sep)
-                full_file_path = os.path.join(target_root, normalized_path)
-                
-                # Ensure directory exists
-                os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
-                
-                # Write file content with UTF-8 encoding - COMPLETE CONTENT
-                with open(full_file_path, 'w', encoding='utf-8') as file:
-                    file.write(content)
-                
-                # Verify the content was written completely (optional, for debugging)
-                with open(full_file_path, 'r', encoding='utf-8') as verify_file:
-                    written_content = verify_file.read()
-                
-                if written_content == content:
-                    files_created += 1
-                    self.logger.debug(f"✓ Created file: {full_file_path} ({len(content)} chars)")
-                else:
-                    files_failed += 1
-                    self.logger.error(f"✗ Content mismatch for: {file_path}")
-                    self.logger.error(f"  Expected: {len(content)} chars, Got: {len(written_content)} chars")
-                
-            except Exception as e:
-                files_failed += 1
-                self.logger.error(f"Failed to create file {file_path}: {str(e)}")
+        files_failed = len(self.file_contents) - files_created
         
         self.logger.info(f"Files created: {files_created}, failed: {files_failed}")
         
@@ -294,20 +410,76 @@ class ProjectRecreator:
         else:
             self.logger.warning(f"⚠ {files_failed} files had issues during creation")
     
+    def _write_file(self, root_prefix: str, file_path: str, content: Union[bytes, memoryview]) -> bool:
+        """
+        Write one file below the target root, given as a path ending in a separator
+        Returns: True if the file was written and verified, False otherwise
+        """
+        try:
+            # Normalize path separators
+            normalized_path = file_path.replace(FOREIGN_SEPARATOR, os.sep)
+            full_file_path = root_prefix + normalized_path
+            
+            # Write the already encoded content - COMPLETE CONTENT
+            # The content is written straight to the file descriptor, as
+            # there is nothing for a buffered file object to batch
+            try:
+                fd = os.open(full_file_path, WRITE_FLAGS, 0o666)
+            except FileNotFoundError:
+                # _create_directories already made every parent directory,
+                # so this only runs if creating one of them failed there
+                os.makedirs(os.path.dirname(full_file_path), exist_ok=True)
+                fd = os.open(full_file_path, WRITE_FLAGS, 0o666)
+            try:
+                # A single write may write only part of a large file
+                data = memoryview(content)
+                while data:
+                    data = data[os.write(fd, data):]
+                
+                # Verify the content was written completely by its size on
+                # disk; write errors are raised by os.write itself, so the
+                # file is not read back
+                written_size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if written_size == len(content):
+                self.logger.debug("✓ Created file: %s (%d bytes)", full_file_path, len(content))
+                return True
+            
+            self.logger.error("✗ Size mismatch for: %s", file_path)
+            self.logger.error("  Expected: %d bytes, Got: %d bytes", len(content), written_size)
+            return False
+            
+        except Exception as e:
+            self.logger.error("Failed to create file %s: %s", file_path, e)
+            return False
+    
     def get_statistics(self) -> Dict:
-        """Get statistics about the parsed project"""
-        total_chars = sum(len(content) for content in self.file_contents.values())
+        """
+        Get statistics about the parsed project
+        File contents are held as encoded bytes, so 'total_characters' is a
+        byte count rather than a count of decoded characters
+        """
+        total_bytes = sum(map(len, self.file_contents.values()))
         
         return {
             'root_directory': self.root_directory,
             'files_parsed': len(self.file_contents),
-            'total_characters': total_chars,
-            'file_paths': list(self.file_contents.keys())[:10]  # First 10 files
+            'total_characters': total_bytes,
+            'file_paths': list(islice(self.file_contents, 10))  # First 10 files
         }
 
 
+# Whether stdout uses a Unicode encoding, checked once; such a stream can
+# print any message, so safe_print skips its fallback handling for it
+STDOUT_IS_UNICODE = (getattr(sys.stdout, 'encoding', None) or '').lower().replace('-', '') in ('utf8', 'utf16', 'utf32')
+
+
 def safe_print(message: str):
     """Safely print messages that might contain Unicode characters"""
+    if STDOUT_IS_UNICODE:
+        print(message)
+        return
     try:
         print(message)
     except UnicodeEncodeError:
@@ -327,7 +499,9 @@ def get_file_path_from_user():
     safe_print(f"Current directory: {current_dir}")
     safe_print("Text files in directory:")
     
-    txt_files = [f for f in os.listdir(current_dir) if f.endswith('.txt')]
+    # Read once; the same list is used for the default file search below
+    with os.scandir(current_dir) as entries:
+        txt_files = [e.name for e in entries if e.name.endswith('.txt') and e.is_file()]
     if txt_files:
         for i, file in enumerate(txt_files, 1):
             safe_print(f"  {i}. {file}")
@@ -352,10 +526,11 @@ def get_file_path_from_user():
         ]
         
         # Also check for any .txt files in directory
-        all_txt_files = [f for f in os.listdir(current_dir) if f.endswith('.txt')]
-        if all_txt_files:
-            default_files = all_txt_files + default_files
+        if txt_files:
+            default_files = txt_files + default_files
         
+        # Existence is still checked, as files may have changed while
+        # waiting for input
         for default_file in default_files:
             full_path = os.path.join(current_dir, default_file)
             if os.path.exists(full_path):
@@ -389,13 +564,13 @@ def main():
             safe_print("\nProject Statistics:")
             safe_print(f"  Root Directory: {stats['root_directory']}")
             safe_print(f"  Files Found: {stats['files_parsed']}")
-            safe_print(f"  Total Characters: {stats['total_characters']:,}")
+            safe_print(f"  Total Bytes: {stats['total_characters']:,}")
             
             if stats['files_parsed'] > 0:
                 safe_print("  Sample files:")
                 for file_path in stats['file_paths']:
-                    file_size = len(recreator.file_contents.get(file_path, ''))
-                    safe_print(f"    - {file_path} ({file_size} chars)")
+                    file_size = len(recreator.file_contents.get(file_path, b''))
+                    safe_print(f"    - {file_path} ({file_size} bytes)")
             else:
                 safe_print("  ⚠ No files were parsed!")
                 safe_print("  Check the source file format and project_recreator.log for details")
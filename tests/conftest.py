@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The scripts live in project_utils/ as standalone modules, not a package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "project_utils"))
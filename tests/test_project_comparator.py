@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from project_comparator import ProjectComparator
+
+
+@pytest.fixture
+def projects(tmp_path):
+    for name in ("p1", "p2"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "same.txt").write_bytes(b"aaaa")
+    return tmp_path
+
+
+@pytest.fixture
+def comparator(projects):
+    comparator = ProjectComparator(str(projects / "p1"), str(projects / "p2"))
+    comparator.hash_cache_file = projects / "hash_cache.sqlite"
+    return comparator
+
+
+def test_cached_hash_is_ignored_once_size_or_mtime_change(comparator, projects):
+    comparator.hash_cache = comparator._open_hash_cache(comparator.hash_cache_file)
+    try:
+        info = comparator.get_file_info(str(projects / "p1" / "same.txt"))
+        info["hash"] = "cached"
+        comparator._store_hash(info)
+
+        assert comparator._get_cached_hash(dict(info)) == "cached"
+        assert comparator._get_cached_hash({**info, "size": info["size"] + 1}) is None
+        assert comparator._get_cached_hash({**info, "mtime_ns": info["mtime_ns"] + 1}) is None
+    finally:
+        comparator._close_hash_cache()
+
+
+def test_rewritten_file_is_not_matched_from_stale_cache(comparator, projects):
+    # The first run finds the files equal and caches both hashes
+    report = comparator.compare_projects()
+    assert report["file_comparison"]["same.txt"]["content_comparison"] is None
+
+    # Same size, new content and a new mtime: the cached hash from the first
+    # run no longer applies to this file
+    changed = projects / "p1" / "same.txt"
+    mtime_ns = os.stat(changed).st_mtime_ns
+    changed.write_bytes(b"bbbb")
+    os.utime(changed, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+
+    report = comparator.compare_projects()
+    assert report["summary"]["common_files_different_content"] == 1
+    assert report["file_comparison"]["same.txt"]["content_comparison"]["identical"] is False
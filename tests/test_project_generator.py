@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+import project_generator
+from project_generator import BINARY_PLACEHOLDER, _iter_large_file
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Stream files in 4-byte chunks so chunk boundaries are easy to hit."""
+    monkeypatch.setattr(project_generator, "READ_CHUNK_SIZE", 4)
+
+
+def stream(tmp_path, data: bytes) -> bytes:
+    path = tmp_path / "large.txt"
+    path.write_bytes(data)
+    return b"".join(_iter_large_file(str(path)))
+
+
+@pytest.mark.parametrize("offset", range(4))
+def test_multibyte_character_split_across_chunks(tmp_path, small_chunks, offset):
+    data = b"a" * offset + "€ é 😀 end".encode("utf-8")
+    assert stream(tmp_path, data) == data
+
+
+@pytest.mark.parametrize("offset", range(4))
+def test_crlf_split_across_chunks(tmp_path, small_chunks, offset):
+    data = b"a" * offset + b"x\r\ny\r\n"
+    assert stream(tmp_path, data) == b"a" * offset + b"x\ny\n"
+
+
+def test_lone_and_trailing_cr(tmp_path, small_chunks):
+    assert stream(tmp_path, b"abc\rdef\r") == b"abc\ndef\n"
+
+
+def test_cr_before_multibyte_character(tmp_path, small_chunks):
+    data = b"abc\r" + "é\r\n".encode("utf-8")
+    assert stream(tmp_path, data) == "abc\né\n".encode("utf-8")
+
+
+def test_invalid_bytes_after_first_chunk_are_binary(tmp_path, small_chunks):
+    assert stream(tmp_path, b"abc" * 10 + b"\xff\xfe") == BINARY_PLACEHOLDER
+
+
+def test_truncated_character_at_end_is_binary(tmp_path, small_chunks):
+    data = "éé".encode("utf-8") + "€".encode("utf-8")[:2]
+    assert stream(tmp_path, data) == BINARY_PLACEHOLDER
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "proj"
+    for rel in ("main.py", "debug.log", "temp_1.txt", "template.txt",
+                "a/build/out.txt", "b/build/out.txt", "a/keep.txt", "a/skip.txt"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    return str(root)
+
+
+def test_glob_file_exclusions(tree):
+    excludes = {"*.log", "temp_*.txt"}
+    structure = project_generator.ProjectStructureGenerator(tree, exclude_files=excludes)
+    contents = project_generator.get_file_contents(tree, exclude_files=excludes)
+    for text in (structure, contents):
+        assert "debug.log" not in text
+        assert "temp_1.txt" not in text
+        assert "template.txt" in text
+        assert "main.py" in text
+
+
+def test_path_exclusions_only_match_that_path(tree):
+    exclude_dirs = {os.path.join("a", "build")}
+    exclude_files = {os.path.join("a", "skip.txt")}
+    contents = project_generator.get_file_contents(
+        tree, exclude_dirs=exclude_dirs, exclude_files=exclude_files
+    )
+    assert "(" + os.path.join("proj", "b", "build", "out.txt") + ")" in contents
+    assert os.path.join("a", "build", "out.txt") not in contents
+    assert os.path.join("a", "keep.txt") in contents
+    assert os.path.join("a", "skip.txt") not in contents
+
+    structure = project_generator.ProjectStructureGenerator(
+        tree, exclude_dirs=exclude_dirs, exclude_files=exclude_files
+    )
+    assert structure.count("build/") == 1
+    assert "skip.txt" not in structure
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+import project_generator
+from project_recreator import ProjectRecreator, _split_file_header
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("main.py (proj\\main.py)", ("main.py", "proj\\main.py")),
+    ("main.py (proj/src/main.py)", ("main.py", "proj/src/main.py")),
+    ("paren (1).txt (proj/paren (1).txt)", ("paren (1).txt", "proj/paren (1).txt")),
+    ("a (b) (c).txt (proj/x (y)/a (b) (c).txt)", ("a (b) (c).txt", "proj/x (y)/a (b) (c).txt")),
+    ("foo(bar)", ("foo", "bar")),
+    ("foo\t(bar)", ("foo", "bar")),
+])
+def test_split_file_header(header, expected):
+    assert _split_file_header(header) == expected
+
+
+@pytest.mark.parametrize("header", ["foo) x", "no path)", "foo (bar"])
+def test_split_file_header_without_path(header):
+    with pytest.raises(ValueError):
+        _split_file_header(header)
+
+
+def test_generator_report_round_trips(tmp_path):
+    files = {
+        "main.py": "import os\r\n\r\nprint('hi')\r\n",
+        "paren (1).txt": "name with a paren",
+        "src/deep/notes.md": "ünïcödé € 😀\nsecond line\n",
+        "src/quoted.txt": "────── FILE END: main.py (proj/main.py) ──────\nstill quoted.txt",
+    }
+    root = tmp_path / "proj"
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode("utf-8"))
+
+    report = tmp_path / "report.txt"
+    report.write_bytes(b"".join(project_generator.iter_report(str(root))))
+
+    recreator = ProjectRecreator(str(report))
+    recreator.script_dir = str(tmp_path / "out")
+    os.mkdir(recreator.script_dir)
+    assert recreator.parse_source_file()
+    assert recreator.root_directory == "proj"
+    assert len(recreator.file_contents) == len(files)
+    assert recreator.create_project()
+
+    copy_root = tmp_path / "out" / "proj_copy" / "proj"
+    for rel, text in files.items():
+        # Contents come back with newlines normalised and surrounding
+        # whitespace stripped, as the report format does not keep either
+        expected = text.replace("\r\n", "\n").strip().replace("\n", os.linesep)
+        assert (copy_root / rel).read_bytes() == expected.encode("utf-8")